@@ -14,6 +14,6 @@ except FileNotFoundError as exc:
 
 # pylint: disable=wrong-import-position
 
-from . import utils
+from . import logs, utils
 from .core import *
 from .utils.constants import *
@@ -0,0 +1,265 @@
+"""Run the bot as several processes, each owning a contiguous slice of the shards.
+
+Usage: python -m botto.cluster
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import discord
+from discord.backoff import ExponentialBackoff
+
+from botto import Botto, config
+from botto.logs import setup_logging
+
+try:
+    import ujson as json
+except ImportError:
+    import json  # type: ignore
+
+logger = logging.getLogger("botto.cluster")  # pylint: disable=invalid-name
+
+SOCKET_PATH: str = os.path.abspath("botto-cluster.sock")
+
+# Seconds to wait for a cluster to report its shards as ready before starting the next one
+READY_TIMEOUT_PER_SHARD: float = 10.0
+# Seconds to wait for clusters to answer a gather request
+GATHER_TIMEOUT: float = 5.0
+# Seconds to wait for clusters to exit before killing them
+STOP_TIMEOUT: float = 30.0
+
+
+def run_cluster(cluster_id: int, shard_ids: List[int], shard_count: int, socket_path: str) -> None:
+    """Entry point of a cluster worker process."""
+    setup_logging(cluster_id)
+    bot: Botto = Botto(
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        cluster_id=cluster_id,
+        cluster_socket=socket_path,
+    )
+    bot.run()
+
+
+def split_shards(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """Split shard IDs into contiguous slices of nearly equal size."""
+    per_cluster, extra = divmod(shard_count, cluster_count)
+    slices: List[List[int]] = []
+    start: int = 0
+    for cluster_id in range(cluster_count):
+        size: int = per_cluster + (cluster_id < extra)
+        slices.append(list(range(start, start + size)))
+        start += size
+    return [shard_ids for shard_ids in slices if shard_ids]
+
+
+class Cluster:
+    def __init__(self, cluster_id: int, shard_ids: List[int]) -> None:
+        self.cluster_id: int = cluster_id
+        self.shard_ids: List[int] = shard_ids
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.ready: asyncio.Event = asyncio.Event()
+        self.backoff: ExponentialBackoff = ExponentialBackoff()
+        self.restart_at: Optional[float] = None
+        self.finished: bool = False
+
+    def send(self, payload: Dict[str, Any]) -> None:
+        if self.writer is not None and not self.writer.is_closing():
+            self.writer.write(json.dumps(payload).encode("utf-8") + b"\n")
+
+
+class ClusterLauncher:
+    """Spawn, supervise and relay messages between cluster worker processes."""
+
+    def __init__(
+        self, cluster_count: int, shard_count: Optional[int] = None, socket_path: str = SOCKET_PATH
+    ) -> None:
+        self.cluster_count: int = cluster_count
+        self.shard_count: Optional[int] = shard_count
+        self.socket_path: str = socket_path
+        self.clusters: Dict[int, Cluster] = {}
+        self.stopping: bool = False
+        self._pending: Dict[str, Dict[int, asyncio.Future]] = {}
+        self._mp_context = multiprocessing.get_context("spawn")
+
+    async def fetch_shard_count(self) -> int:
+        http: discord.http.HTTPClient = discord.http.HTTPClient()
+        try:
+            await http.static_login(config["TOKEN"], bot=True)
+            shard_count, _ = await http.get_bot_gateway()
+        finally:
+            await http.close()
+        return shard_count
+
+    async def start(self) -> None:
+        if self.shard_count is None:
+            self.shard_count = await self.fetch_shard_count()
+        shard_slices = split_shards(self.shard_count, self.cluster_count)
+        logger.info(
+            "Launching %s shards in %s clusters: %s",
+            self.shard_count,
+            len(shard_slices),
+            ", ".join(f"{shard_ids[0]}-{shard_ids[-1]}" for shard_ids in shard_slices),
+        )
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+
+        try:
+            for cluster_id, shard_ids in enumerate(shard_slices):
+                cluster = self.clusters[cluster_id] = Cluster(cluster_id, shard_ids)
+                self.spawn(cluster)
+                # Clusters start one after another so their shards don't identify at once
+                try:
+                    await asyncio.wait_for(
+                        cluster.ready.wait(), timeout=READY_TIMEOUT_PER_SHARD * len(shard_ids)
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("Cluster %s did not become ready in time.", cluster_id)
+                if self.stopping:
+                    break
+            await self.supervise()
+        finally:
+            server.close()
+            await server.wait_closed()
+            await self.join()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def spawn(self, cluster: Cluster) -> None:
+        cluster.ready.clear()
+        cluster.restart_at = None
+        cluster.process = self._mp_context.Process(
+            target=run_cluster,
+            args=(cluster.cluster_id, cluster.shard_ids, self.shard_count, self.socket_path),
+            name=f"botto-cluster-{cluster.cluster_id}",
+        )
+        cluster.process.start()
+        logger.info("Started cluster %s (PID %s).", cluster.cluster_id, cluster.process.pid)
+
+    async def supervise(self) -> None:
+        """Restart crashed clusters until stopped or all clusters exited cleanly."""
+        while not self.stopping:
+            await asyncio.sleep(1)
+            now: float = time.monotonic()
+            for cluster in self.clusters.values():
+                if cluster.finished or cluster.process is None:
+                    continue
+                if cluster.restart_at is not None:
+                    if now >= cluster.restart_at:
+                        self.spawn(cluster)
+                    continue
+                if cluster.process.is_alive():
+                    continue
+                if cluster.process.exitcode == 0:
+                    logger.info("Cluster %s exited.", cluster.cluster_id)
+                    cluster.finished = True
+                    continue
+                delay: float = cluster.backoff.delay()
+                logger.error(
+                    "Cluster %s crashed with exit code %s. Restarting in %.2f seconds.",
+                    cluster.cluster_id,
+                    cluster.process.exitcode,
+                    delay,
+                )
+                cluster.restart_at = now + delay
+            if self.clusters and all(cluster.finished for cluster in self.clusters.values()):
+                logger.info("All clusters exited.")
+                return
+
+    def stop(self) -> None:
+        logger.info("Received signal to stop clusters.")
+        self.stopping = True
+        for cluster in self.clusters.values():
+            if cluster.process is not None and cluster.process.is_alive():
+                cluster.process.terminate()
+
+    async def join(self) -> None:
+        deadline: float = time.monotonic() + STOP_TIMEOUT
+        for cluster in self.clusters.values():
+            process = cluster.process
+            if process is None:
+                continue
+            while process.is_alive() and time.monotonic() < deadline:
+                await asyncio.sleep(0.5)
+            if process.is_alive():
+                logger.warning("Killing cluster %s after timeout.", cluster.cluster_id)
+                process.kill()
+            process.join()
+
+    # ------ IPC ------
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        cluster: Optional[Cluster] = None
+        try:
+            while True:
+                line: bytes = await reader.readline()
+                if not line:
+                    break
+                payload: Dict[str, Any] = json.loads(line)
+                op: str = payload["op"]
+                if op == "identify":
+                    cluster = self.clusters[payload["cluster_id"]]
+                    cluster.writer = writer
+                elif cluster is None:
+                    continue
+                elif op == "ready":
+                    cluster.ready.set()
+                elif op == "gather":
+                    asyncio.ensure_future(self.gather(cluster, payload))
+                elif op == "response":
+                    futures = self._pending.get(payload["nonce"], {})
+                    future = futures.get(cluster.cluster_id)
+                    if future is not None and not future.done():
+                        future.set_result(payload["data"])
+        finally:
+            if cluster is not None and cluster.writer is writer:
+                cluster.writer = None
+            writer.close()
+
+    async def gather(self, requester: Cluster, payload: Dict[str, Any]) -> None:
+        """Collect data from every connected cluster and send it to the requester."""
+        loop = asyncio.get_running_loop()
+        nonce: str = uuid.uuid4().hex
+        futures: Dict[int, asyncio.Future] = {}
+        for cluster in self.clusters.values():
+            if cluster.writer is None:
+                continue
+            futures[cluster.cluster_id] = loop.create_future()
+            cluster.send({"op": "collect", "kind": payload["kind"], "nonce": nonce})
+
+        self._pending[nonce] = futures
+        try:
+            if futures:
+                await asyncio.wait(futures.values(), timeout=GATHER_TIMEOUT)
+        finally:
+            del self._pending[nonce]
+
+        data: Dict[int, Any] = {
+            cluster_id: future.result() for cluster_id, future in futures.items() if future.done()
+        }
+        requester.send({"op": "result", "nonce": payload["nonce"], "data": data})
+
+
+def main() -> None:
+    setup_logging()
+    launcher: ClusterLauncher = ClusterLauncher(config["CLUSTER_COUNT"], config["SHARD_COUNT"])
+    asyncio.run(launcher.start())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
 from .bot import Botto
-from .checks import require_restricted_api
+from .checks import require_database, require_restricted_api
 from .command import command, group, Command, Group
+from .console import ConsoleQueue
 from .context import Context
 from .errors import (
     BotMissingFundamentalPermissions,
     SubcommandRequired,
     NotConnectedToRestrictedApi,
+    NotConnectedToDatabase,
 )
+from .interactions import InteractionListener, InteractionRouter
+from .messages import MessageCache, MessageFetcher
+from .paste import Paste, PasteService
+from .prefixes import PrefixManager, PrefixTrie
+from .sampler import ProcessSample, ProcessSampler
+from .suggestions import CommandIndex
+from .tracker import ErrorRecord, ErrorTracker
@@ -1,9 +1,11 @@
 import asyncio
 import datetime
+import inspect
 import logging
 import signal
 import sys
-from typing import Any, Callable, Dict, Generator, List, Optional
+import time
+from typing import Any, Callable, Dict, Generator, List, Optional, Set, Tuple, Union
 
 import aiohttp
 import asyncpg
@@ -12,12 +14,30 @@ import psutil
 
 import discord
 from discord.client import _cleanup_loop
+from discord.gateway import DiscordWebSocket
+from discord.http import Route
+from discord.shard import Shard
 from discord.ext import commands
 from discord.ext import tasks
 
 from botto import config, utils  # pylint: disable=cyclic-import
+from . import console
+from .console import ConsoleQueue
 from .context import Context
 from .errors import BotMissingFundamentalPermissions
+from .gateway import GatewaySession, GatewaySessionStore, get_session_filename
+from .interactions import InteractionRouter
+from .ipc import ClusterClient
+from .messages import IndexedConnectionState, MessageFetcher
+from .metrics import Metrics
+from .paste import PasteService
+from .permissions import FUNDAMENTAL_PERMISSIONS, PermissionCache
+from .prefixes import PrefixManager
+from .sampler import ProcessSampler
+from .statistics import CacheStatistics
+from .suggestions import CommandIndex
+from .tracker import ErrorTracker
+from .watchdog import LoopWatchdog
 
 try:
     import ujson as json
@@ -33,11 +53,32 @@ else:
 
 logger = logging.getLogger("botto")  # pylint: disable=invalid-name
 
+# Seconds between IDENTIFY payloads of shards in the same rate limit bucket
+IDENTIFY_INTERVAL: float = 5.0
+# Guilds of resumed shards fetched over REST at once
+GUILD_REBUILD_CONCURRENCY: int = 5
+# discord.py versions whose AutoShardedClient internals resuming gateway sessions relies on
+SHARD_INTERNALS_VERSIONS: Tuple[Tuple[int, int], ...] = ((1, 6), (1, 7))
+# Seconds to wait for the members of a resumed guild, like discord.py does for GUILD_CREATE
+GUILD_CHUNK_TIMEOUT: float = 60.0
+
 
 class Botto(commands.AutoShardedBot):
-    def __init__(self, **kwargs: Any) -> None:
+    # Set by AutoShardedClient, None until launch_shards uses the recommended count
+    shard_count: Optional[int]
+
+    def __init__(
+        self,
+        *,
+        cluster_id: Optional[int] = None,
+        cluster_socket: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        # Bumped whenever commands change, for caches derived from them
+        # Set first since the default help command is added on initialization
+        self.commands_version: int = 0
         super().__init__(
-            command_prefix=commands.when_mentioned_or(*config["PREFIXES"]),
+            command_prefix=Botto.get_prefix_list,
             pm_help=False,
             owner_id=config["OWNER_ID"],
             intents=discord.Intents(
@@ -50,15 +91,76 @@ class Botto(commands.AutoShardedBot):
         )
         self.ready_time: Optional[datetime.datetime] = None
 
+        self.cluster_id: Optional[int] = cluster_id
+        self.cluster: Optional[ClusterClient] = (
+            ClusterClient(self, cluster_id, cluster_socket)
+            if cluster_id is not None and cluster_socket
+            else None
+        )
+
+        self.prefixes: PrefixManager = PrefixManager(self, config["PREFIXES"])
+        self.permission_cache: PermissionCache = PermissionCache(self)
+        self.add_listeners_of(self.permission_cache)
+        self.cache_statistics: CacheStatistics = CacheStatistics(self)
+        self.add_listeners_of(self.cache_statistics)
+        self.metrics: Metrics = Metrics(self)
+        self.add_listeners_of(self.metrics)
+        self.interactions: InteractionRouter = InteractionRouter(self)
+        self.add_listeners_of(self.interactions)
+        self.paginators: utils.PaginatorRegistry = utils.PaginatorRegistry()
+        self.message_fetcher: MessageFetcher = MessageFetcher(self)
+        self.add_listeners_of(self.message_fetcher)
+        self.command_index: CommandIndex = CommandIndex(self)
+
         self.process: psutil.Process = psutil.Process()
+        self.sampler: ProcessSampler = ProcessSampler(self)
+        self.watchdog: Optional[LoopWatchdog] = (
+            LoopWatchdog(self, config["LOOP_LAG_THRESHOLD"])
+            if config["LOOP_LAG_THRESHOLD"]
+            else None
+        )
 
         self.session: aiohttp.ClientSession = aiohttp.ClientSession(
             loop=self.loop, json_serialize=json.dumps, raise_for_status=True
         )
+        self.pastes: PasteService = PasteService(self)
+        self.error_tracker: ErrorTracker = ErrorTracker(self)
+        self.console: ConsoleQueue = ConsoleQueue(self)
 
         self.add_check(self._check_fundamental_permissions)
         self.after_invoke(self.unlock_after_invoke)
         self.maintain_presence.start()  # pylint: disable=no-member
+        self.sampler.sample_loop.start()  # pylint: disable=no-member
+        self.error_tracker.digest_loop.start()  # pylint: disable=no-member
+        self.console.start()
+
+        # Updated from the gateway's session start limit when launching shards
+        self.max_concurrency: int = 1
+        self._identify_locks: Dict[int, asyncio.Lock] = {}
+        self._last_identify: Dict[int, float] = {}
+        self._shard_launch_times: Dict[int, float] = {}
+
+        self.gateway_session_store: Optional[GatewaySessionStore] = None
+        if config["GATEWAY_SESSION_FILE"]:
+            if discord.version_info[:2] in SHARD_INTERNALS_VERSIONS:
+                self.gateway_session_store = GatewaySessionStore(
+                    get_session_filename(config["GATEWAY_SESSION_FILE"], cluster_id),
+                    max_guilds=config["GATEWAY_RESUME_MAX_GUILDS"],
+                )
+            else:
+                logger.warning(
+                    "Resuming gateway sessions is not supported with discord.py %s, "
+                    "shards always identify.",
+                    discord.__version__,
+                )
+        self._resumable_sessions: Dict[int, GatewaySession] = {}
+        self._resuming_shards: Set[int] = set()
+        # Guilds saved with the sessions of resumed shards, fetched once resumed
+        self._resumed_guild_ids: Dict[int, Tuple[int, ...]] = {}
+        self._guild_rebuild_semaphore: asyncio.Semaphore = asyncio.Semaphore(
+            GUILD_REBUILD_CONCURRENCY
+        )
+        self._identified_on_launch: bool = False
 
     # ------ Properties ------
 
@@ -109,14 +211,36 @@ class Botto(commands.AutoShardedBot):
             raise ValueError("Could not find console channel in channel cache.")
         return channel
 
-    async def send_console(self, *args, **kwargs) -> discord.Message:
-        try:
-            return await self.get_console_channel().send(*args, **kwargs)
-        except ValueError:
-            return await (await self.fetch_owner()).send(*args, **kwargs)
+    async def send_console(
+        self,
+        content: Optional[str] = None,
+        *,
+        embed: Optional[discord.Embed] = None,
+        priority: int = console.INFO,
+    ) -> None:
+        """Queue a message for the console channel, or the owner if there is none."""
+        self.console.put(content, embed=embed, priority=priority)
+
+    async def get_or_fetch_message(self, channel_id: int, message_id: int) -> discord.Message:
+        """Return a message from the cache, fetching it if missing.
+
+        Raises the same exceptions as fetch_message.
+        """
+        return await self.message_fetcher.get_or_fetch_message(channel_id, message_id)
 
     # ------ Basic methods ------
 
+    def _get_state(self, **options: Any) -> IndexedConnectionState:
+        return IndexedConnectionState(
+            dispatch=self.dispatch,
+            handlers=self._handlers,
+            syncer=self._syncer,
+            hooks=self._hooks,
+            http=self.http,
+            loop=self.loop,
+            **options,
+        )
+
     async def connect_to_database(self, dsn: str) -> None:
         self.pool: asyncpg.Pool = await asyncpg.create_pool(dsn)  # pylint: disable=no-member
         if not hasattr(self, "jinja_env"):
@@ -135,6 +259,10 @@ class Botto(commands.AutoShardedBot):
         dsn = config["DATABASE_URI"]
         if dsn:
             loop.run_until_complete(self.connect_to_database(dsn))
+            loop.run_until_complete(self.prefixes.load())
+
+        if self.cluster:
+            loop.run_until_complete(self.cluster.connect())
 
         for module in config["STARTUP_MODULES"]:
             self.load_extension(module)
@@ -152,6 +280,9 @@ class Botto(commands.AutoShardedBot):
             finally:
                 await self.shutdown()
 
+        if self.watchdog:
+            self.watchdog.start()
+
         stop_loop_on_completion = lambda future: loop.stop()  # noqa: E731
 
         future = asyncio.ensure_future(runner(), loop=loop)
@@ -170,10 +301,17 @@ class Botto(commands.AutoShardedBot):
 
     async def shutdown(self) -> None:
         self.maintain_presence.cancel()  # pylint: disable=no-member
+        self.sampler.sample_loop.cancel()  # pylint: disable=no-member
+        self.error_tracker.digest_loop.cancel()  # pylint: disable=no-member
+        await self.console.stop()
+        if self.watchdog:
+            self.watchdog.stop()
 
         for ext in tuple(self.extensions):
             self.unload_extension(ext)
 
+        if self.cluster:
+            await self.cluster.close()
         if not self.session.closed:
             await self.session.close()
             logger.info("Gracefully closed asynchronous HTTP client session.")
@@ -184,6 +322,45 @@ class Botto(commands.AutoShardedBot):
             logger.info("Closing client gracefully...")
             await self.close()
 
+    def get_prefix_list(self, message: discord.Message) -> List[str]:
+        """Return every prefix usable in the message's guild, mentions included."""
+        return self.prefixes.get_message_trie(message).prefixes
+
+    async def get_prefix(self, message: discord.Message) -> Union[str, List[str]]:
+        """Return the prefix the message starts with, otherwise all usable prefixes."""
+        trie = self.prefixes.get_message_trie(message)
+        return trie.match(message.content) or trie.prefixes
+
+    async def on_message(self, message: discord.Message) -> None:
+        """Filter out messages that cannot be commands before processing them.
+
+        Bare mentions of the bot are dispatched as the bare_mention event instead.
+        """
+        if message.author.bot:
+            return
+        content: str = message.content
+        if self.prefixes.is_bare_mention(content):
+            self.dispatch("bare_mention", message)
+            return
+        if self.prefixes.get_message_trie(message).match(content) is None:
+            return
+        await self.process_commands(message)
+
+    def add_command(self, command: commands.Command) -> None:
+        super().add_command(command)
+        self.commands_version += 1
+
+    def remove_command(self, name: str) -> Optional[commands.Command]:
+        command: Optional[commands.Command] = super().remove_command(name)
+        self.commands_version += 1
+        return command
+
+    def add_listeners_of(self, obj: Any) -> None:
+        """Register every on_* coroutine method of an object as an event listener."""
+        for name, method in inspect.getmembers(obj, inspect.iscoroutinefunction):
+            if name.startswith("on_"):
+                self.add_listener(method, name)
+
     async def process_commands(self, message: discord.Message) -> None:
         if message.author.bot:
             return
@@ -192,6 +369,12 @@ class Botto(commands.AutoShardedBot):
             return
         await self.invoke(ctx)
 
+    async def invoke(self, ctx: Context) -> None:
+        start: float = time.perf_counter()
+        await super().invoke(ctx)
+        if ctx.command is not None:
+            self.metrics.observe_command(ctx, time.perf_counter() - start)
+
     @property
     def send_api_event(self) -> Callable:
         cog = self.get_cog("RestrictedApi")
@@ -207,32 +390,247 @@ class Botto(commands.AutoShardedBot):
         cog = self.get_cog("RestrictedApi")
         return round(cog.latency * 1000) if cog and cog.latency else None
 
-    # ------ Checks and invocation hooks ------
+    @property
+    def restricted_api_pings(self) -> Dict[str, Optional[int]]:
+        """Latest ping of each restricted API backend by name, None if not answered."""
+        cog = self.get_cog("RestrictedApi")
+        if cog is None:
+            return {}
+        return {
+            backend.name: round(backend.latency * 1000) if backend.latency is not None else None
+            for backend in cog.backends
+        }
+
+    # ------ Sharding ------
+
+    async def launch_shards(self) -> None:
+        """Launch shards in waves of max_concurrency shards identifying in parallel."""
+        data: Dict[str, Any] = await self.http.request(Route("GET", "/gateway/bot"))
+        limit: Dict[str, int] = data["session_start_limit"]
+        self.max_concurrency = limit.get("max_concurrency", 1)
+        logger.info(
+            "Session start limit: %s of %s remaining, max concurrency of %s.",
+            limit["remaining"],
+            limit["total"],
+            self.max_concurrency,
+        )
 
-    async def _check_fundamental_permissions(self, ctx: Context) -> bool:
-        # read_messages is an implicit requirement.
-        # This check wouldn't run if it didn't read a command message. (duh)
-        required_perms = discord.Permissions()
-        required_perms.update(
-            send_messages=True,
-            embed_links=True,
-            attach_files=True,
-            read_message_history=True,
-            external_emojis=True,
-            add_reactions=True,
+        if self.shard_count is None:
+            self.shard_count = data["shards"]
+        gateway: str = await self.http.get_gateway()
+
+        self._connection.shard_count = self.shard_count
+        shard_ids: List[int] = self.shard_ids if self.shard_ids else list(range(self.shard_count))
+        self._connection.shard_ids = shard_ids
+
+        if self.gateway_session_store:
+            self._resumable_sessions = self.gateway_session_store.load(self.shard_count)
+            if self._resumable_sessions:
+                # READY carries the client user but resumed sessions never receive it
+                await self._load_client_user()
+            self.save_gateway_sessions_loop.start()  # pylint: disable=no-member
+
+        start: float = time.perf_counter()
+        # Consecutive shards fall in different rate limit buckets (shard_id % max_concurrency)
+        # so each wave identifies at once, and before_identify_hook spaces out the waves
+        for index in range(0, len(shard_ids), self.max_concurrency):
+            wave: List[int] = shard_ids[index : index + self.max_concurrency]
+            await asyncio.gather(
+                *(
+                    self.launch_shard(gateway, shard_id, initial=shard_id == shard_ids[0])
+                    for shard_id in wave
+                )
+            )
+        logger.info(
+            "Launched %s shards in %.2f seconds.", len(shard_ids), time.perf_counter() - start
         )
 
-        actual_perms = ctx.channel.permissions_for(ctx.me)
+        self._connection.shards_launched.set()
 
-        missing: List[str] = [
-            perm
-            for perm, value in required_perms
-            if value is True and getattr(actual_perms, perm) is not True
+    async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
+        # Failed launches are retried through this method so keep the first launch time
+        self._shard_launch_times.setdefault(shard_id, time.perf_counter())
+        session: Optional[GatewaySession] = self._resumable_sessions.pop(shard_id, None)
+        if session is None:
+            await super().launch_shard(gateway, shard_id, initial=initial)
+            return
+
+        try:
+            coro = DiscordWebSocket.from_client(
+                self,
+                initial=initial,
+                gateway=gateway,
+                shard_id=shard_id,
+                session=session.session_id,
+                sequence=session.sequence,
+                resume=True,
+            )
+            ws: DiscordWebSocket = await asyncio.wait_for(coro, timeout=180.0)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Failed to resume shard %s. Identifying instead.", shard_id)
+            await super().launch_shard(gateway, shard_id, initial=initial)
+            return
+
+        # An invalid session is answered with INVALID_SESSION, after which the shard
+        # falls back to IDENTIFY on its own
+        self._resuming_shards.add(shard_id)
+        self._resumed_guild_ids[shard_id] = session.guild_ids
+        shards, queue = self._get_shard_internals()
+        shard: Shard = Shard(ws, self, queue.put_nowait)
+        shards[shard_id] = shard
+        shard.launch()
+
+    def _get_shard_internals(self) -> Tuple[Dict[int, Shard], asyncio.Queue]:
+        """Return the shards by ID and the event queue of AutoShardedClient.
+
+        Launching and closing shards with a session needs both, which discord.py keeps in
+        name-mangled attributes with no public equivalent. Gateway sessions are only
+        enabled on the versions in SHARD_INTERNALS_VERSIONS, known to have them.
+        """
+        if discord.version_info[:2] not in SHARD_INTERNALS_VERSIONS:
+            raise RuntimeError(f"Shard internals of discord.py {discord.__version__} are unknown.")
+        return (
+            getattr(self, "_AutoShardedClient__shards"),
+            getattr(self, "_AutoShardedClient__queue"),
+        )
+
+    async def before_identify_hook(self, shard_id: int, *, initial: bool = False) -> None:
+        """Wait until the shard's rate limit bucket allows another IDENTIFY."""
+        bucket: int = shard_id % self.max_concurrency
+        lock: asyncio.Lock = self._identify_locks.setdefault(bucket, asyncio.Lock())
+        async with lock:
+            last_identify: Optional[float] = self._last_identify.get(bucket)
+            if last_identify is not None:
+                delay: float = last_identify + IDENTIFY_INTERVAL - time.monotonic()
+                if delay > 0:
+                    logger.debug("Shard %s waiting %.2f seconds to identify.", shard_id, delay)
+                    await asyncio.sleep(delay)
+            self._last_identify[bucket] = time.monotonic()
+
+    async def _load_client_user(self) -> None:
+        data: Dict[str, Any] = await self.http.request(Route("GET", "/users/@me"))
+        user: discord.ClientUser = discord.ClientUser(state=self._connection, data=data)
+        self._connection.user = user
+        self._connection._users[user.id] = user  # pylint: disable=protected-access
+
+    async def _rebuild_guild(self, guild_id: int) -> Optional[discord.Guild]:
+        # pylint: disable=protected-access
+        state: IndexedConnectionState = self._connection
+        data: Dict[str, Any] = await self.http.request(
+            Route("GET", "/guilds/{guild_id}", guild_id=guild_id), params={"with_counts": "true"}
+        )
+        data["member_count"] = data.get("approximate_member_count")
+        data["channels"] = await self.http.get_all_guild_channels(guild_id)
+        data["members"] = [await self.http.get_member(guild_id, state.self_id)]
+        # GUILD_CREATE may have arrived in the meantime, for example for a new guild
+        if state._get_guild(guild_id) is not None:
+            return None
+        return state._add_guild_from_data(data)
+
+    async def _chunk_and_dispatch_available(self, guild: discord.Guild) -> None:
+        # pylint: disable=protected-access
+        state: IndexedConnectionState = self._connection
+        # Listeners such as the cache statistics count the members of available guilds
+        if state._guild_needs_chunking(guild):
+            try:
+                await asyncio.wait_for(state.chunk_guild(guild), timeout=GUILD_CHUNK_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out chunking guild %s of a resumed shard.", guild.id)
+        self.dispatch("guild_available", guild)
+
+    async def rebuild_resumed_guilds(self, shard_ids: List[int]) -> None:
+        """Add guilds of resumed shards to the cache, fetching them over REST.
+
+        Resumed sessions never receive GUILD_CREATE, so without this their guild
+        messages have no guild and their channels are bare discord.Object instances.
+        Guilds are those saved with the sessions, this costs three requests per guild.
+        guild_available is dispatched once a guild's members are chunked, if needed.
+        """
+        start: float = time.perf_counter()
+
+        async def rebuild(guild_id: int) -> None:
+            async with self._guild_rebuild_semaphore:
+                try:
+                    guild: Optional[discord.Guild] = await self._rebuild_guild(guild_id)
+                except discord.HTTPException as exc:
+                    logger.warning(
+                        "Failed to fetch guild %s of a resumed shard. (%s: %s)",
+                        guild_id,
+                        type(exc).__name__,
+                        exc,
+                    )
+                    return
+            # Chunking goes through the gateway so it does not hold up other fetches
+            if guild is not None:
+                await self._chunk_and_dispatch_available(guild)
+
+        pending: List[int] = [
+            guild_id
+            for shard_id in shard_ids
+            for guild_id in self._resumed_guild_ids.pop(shard_id, ())
+            if self._connection._get_guild(guild_id) is None  # pylint: disable=protected-access
         ]
+        await asyncio.gather(*(rebuild(guild_id) for guild_id in pending))
+        logger.info(
+            "Fetched %s guilds of resumed shards %s in %.2f seconds.",
+            len(pending),
+            shard_ids,
+            time.perf_counter() - start,
+        )
+
+    def get_gateway_sessions(self) -> Dict[int, GatewaySession]:
+        guild_ids: Dict[int, List[int]] = {}
+        for guild in self.guilds_view():
+            guild_ids.setdefault(guild.shard_id, []).append(guild.id)
+        return {
+            shard_id: GatewaySession(
+                shard.ws.session_id, shard.ws.sequence, tuple(guild_ids.get(shard_id, ()))
+            )
+            for shard_id, shard in self._get_shard_internals()[0].items()
+            if shard.ws.session_id is not None and shard.ws.sequence is not None
+        }
+
+    @tasks.loop(seconds=30)
+    async def save_gateway_sessions_loop(self) -> None:
+        assert self.gateway_session_store is not None
+        sessions: Dict[int, GatewaySession] = self.get_gateway_sessions()
+        if sessions:
+            await self.loop.run_in_executor(
+                None, self.gateway_session_store.save, self.shard_count, sessions
+            )
+
+    async def close(self) -> None:
+        """Close the connection to Discord, keeping gateway sessions resumable if enabled."""
+        if self.gateway_session_store and not self.is_closed():
+            self.save_gateway_sessions_loop.cancel()  # pylint: disable=no-member
+            sessions: Dict[int, GatewaySession] = self.get_gateway_sessions()
+            # Sessions only exist once shards are launched with a known count
+            if sessions and self.shard_count is not None:
+                self.gateway_session_store.save(self.shard_count, sessions)
+                logger.info("Saved gateway sessions of %s shards.", len(sessions))
+            # Closing with code 1000 invalidates the session so close with 4000 first,
+            # the second close from AutoShardedClient.close is then a no-op
+            for shard in self._get_shard_internals()[0].values():
+                shard._cancel_task()  # pylint: disable=protected-access
+                await shard.ws.close(code=4000)
+        await super().close()
+
+    # ------ Checks and invocation hooks ------
 
-        if not missing:
+    async def _check_fundamental_permissions(self, ctx: Context) -> bool:
+        if not isinstance(ctx.channel, (discord.abc.GuildChannel, discord.abc.PrivateChannel)):
+            # The guild of a resumed shard is not fetched yet and the channel is a bare
+            # discord.Object, which can neither be checked nor replied to
+            return False
+        missing_value: int = self.permission_cache.get_missing(
+            ctx.channel, ctx.me, FUNDAMENTAL_PERMISSIONS.value
+        )
+        if not missing_value:
             return True
 
+        missing: List[str] = [
+            perm for perm, value in discord.Permissions(missing_value) if value is True
+        ]
         raise BotMissingFundamentalPermissions(missing)
 
     async def unlock_after_invoke(self, ctx: Context) -> None:
@@ -276,8 +674,10 @@ class Botto(commands.AutoShardedBot):
     async def on_ready(self) -> None:
         self.ready_time = datetime.datetime.utcnow()
         logger.info("Bot has connected.")
+        if self.cluster:
+            self.cluster.notify_ready()
         try:
-            embed: Optional[discord.Embed] = self.cogs["Meta"].get_statistics_embed()
+            embed: Optional[discord.Embed] = await self.cogs["Meta"].get_statistics_embed()
         except KeyError:
             embed = None
             logger.warning("Meta cog was not found, statistics embed will not be sent.")
@@ -286,13 +686,46 @@ class Botto(commands.AutoShardedBot):
             logger.exception("psutil lacks permissions to check system information.")
         await self.send_console("Bot has connected.", embed=embed)
 
+    async def on_shard_connect(self, shard_id: int) -> None:
+        self._identified_on_launch = True
+        self._resuming_shards.discard(shard_id)
+        self._resumed_guild_ids.pop(shard_id, None)
+        start: Optional[float] = self._shard_launch_times.get(shard_id)
+        if start is not None:
+            logger.info(
+                "Shard %s received READY %.2f seconds after launch.",
+                shard_id,
+                time.perf_counter() - start,
+            )
+
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        if shard_id not in self._resuming_shards:
+            return
+        start: Optional[float] = self._shard_launch_times.pop(shard_id, None)
+        if start is not None:
+            logger.info(
+                "Shard %s resumed %.2f seconds after launch.", shard_id, time.perf_counter() - start
+            )
+        await self.rebuild_resumed_guilds([shard_id])
+        self._resuming_shards.discard(shard_id)
+        # READY is only dispatched by shards that identified, so dispatch it
+        # when every shard resumed its previous session and has its guilds instead
+        if not self._resuming_shards and not self._identified_on_launch and not self.is_ready():
+            self._handle_ready()
+            self.dispatch("ready")
+
+    async def on_shard_ready(self, shard_id: int) -> None:
+        start: Optional[float] = self._shard_launch_times.pop(shard_id, None)
+        if start is not None:
+            logger.info(
+                "Shard %s became ready %.2f seconds after launch.",
+                shard_id,
+                time.perf_counter() - start,
+            )
+
     async def on_error(self, event_method: str, *args: Any, **kwargs: Any) -> None:
         _, error, _ = sys.exc_info()
         assert isinstance(error, Exception)
-        if event_method.startswith("on_restricted_api"):
-            payload: Dict[str, Any] = args[0]
-            self.dispatch("restricted_api_event_handler_error", event_method[18:], payload, error)
-            return
         if utils.is_bad_message_ref_err(error):
             return
         logger.exception("Unhandled exception in '%s' event handler.", event_method)
@@ -1,14 +1,24 @@
 from discord.ext import commands
 
 from .context import Context
-from .errors import NotConnectedToRestrictedApi
+from .errors import NotConnectedToDatabase, NotConnectedToRestrictedApi
 
 
 def require_restricted_api():
     def predicate(ctx: Context) -> bool:
         cog = ctx.bot.get_cog("RestrictedApi")
-        if not cog or not cog.websocket:
+        # Events are queued during short disconnects
+        if not cog or not cog.is_available:
             raise NotConnectedToRestrictedApi
         return True
 
     return commands.check(predicate)
+
+
+def require_database():
+    def predicate(ctx: Context) -> bool:
+        if not hasattr(ctx.bot, "pool"):
+            raise NotConnectedToDatabase
+        return True
+
+    return commands.check(predicate)
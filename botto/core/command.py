@@ -1,5 +1,8 @@
 import asyncio
 import functools
+import inspect
+import time
+from typing import Optional
 
 import discord
 import yaml
@@ -7,6 +10,11 @@ from discord.ext import commands
 
 
 class Command(commands.Command):
+    def __init__(self, func, **kwargs) -> None:
+        super().__init__(func, **kwargs)
+        # Parsed from the help on first use
+        self._short_doc: Optional[str] = None
+
     def help_embed(self, coro):
         if not asyncio.iscoroutinefunction(coro):
             raise TypeError("The help embed function must be a coroutine.")
@@ -30,8 +38,65 @@ class Command(commands.Command):
             pass
         return other
 
+    # Stage timings are collected by botto.core.metrics
+
+    async def can_run(self, ctx) -> bool:
+        if ctx.command is not self:
+            # Help commands check other commands without invoking them
+            return await super().can_run(ctx)
+        start: float = time.perf_counter()
+        try:
+            return await super().can_run(ctx)
+        finally:
+            ctx.timings["checks"] = ctx.timings.get("checks", 0.0) + time.perf_counter() - start
+
+    async def _parse_arguments(self, ctx) -> None:
+        start: float = time.perf_counter()
+        try:
+            await super()._parse_arguments(ctx)
+        finally:
+            ctx.timings["conversion"] = (
+                ctx.timings.get("conversion", 0.0) + time.perf_counter() - start
+            )
+
+    # The callback runs between the before and after invoke hooks, so its time is taken
+    # from the end of the ones to the start of the others
+
+    async def call_before_hooks(self, ctx) -> None:
+        await super().call_before_hooks(ctx)
+        ctx.callback_started = time.perf_counter()
+
+    async def call_after_hooks(self, ctx) -> None:
+        if ctx.callback_started is not None:
+            ctx.timings["callback"] = (
+                ctx.timings.get("callback", 0.0) + time.perf_counter() - ctx.callback_started
+            )
+            ctx.callback_started = None
+        await super().call_after_hooks(ctx)
+
+    @property
+    def help_metadata(self):
+        """Return the YAML of the callback docstring with the command substituted.
+
+        The docstring is parsed on first use and kept on the command. Commands are
+        recreated when their module is reloaded, which discards it.
+        """
+        try:
+            return self._help_metadata
+        except AttributeError:
+            docstring = inspect.getdoc(self.callback)
+            self._help_metadata = (
+                yaml.full_load(docstring.format(command=self)) if docstring else None
+            )
+            return self._help_metadata
+
     @property
     def short_doc(self) -> str:
+        if self._short_doc is None:
+            self._short_doc = self._get_short_doc()
+        return self._short_doc
+
+    def _get_short_doc(self) -> str:
         if self.brief is not None:
             return self.brief
         if self.help is not None:
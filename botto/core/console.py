@@ -0,0 +1,181 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+import logging
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+import discord
+
+from botto import utils  # pylint: disable=cyclic-import
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+logger = logging.getLogger("botto.console")  # pylint: disable=invalid-name
+
+# Lower priorities are sent first
+ERROR = 0
+INFO = 1
+
+# Seconds low priority lines are collected before being sent together
+BATCH_INTERVAL = 10.0
+# Lines kept per batch, the rest are only counted
+MAX_BATCH_LINES = 100
+# Queued messages, once full the newest of the lowest priority are dropped
+MAX_QUEUED = 50
+# Seconds messages still queued on stop have to be sent
+STOP_TIMEOUT = 10.0
+EMBED_DESCRIPTION_LIMIT = 2048
+
+ConsoleMessage = Tuple[Optional[str], Optional[discord.Embed]]
+
+
+class LineBatch:
+    __slots__ = ("color", "lines", "omitted")
+
+    def __init__(self, color: discord.Color) -> None:
+        self.color: discord.Color = color
+        self.lines: List[str] = []
+        self.omitted: int = 0
+
+
+class ConsoleQueue:
+    """Send messages to the console channel, or the owner if there is none, in order.
+
+    Messages are queued by priority and sent one at a time by a single task, so bursts
+    do not compete with command replies for rate limits. Lines added with add_line are
+    collected for BATCH_INTERVAL seconds and sent in as few embeds as possible, and
+    messages beyond MAX_QUEUED are dropped and counted in a summary instead.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self._queue: List[Tuple[int, int, ConsoleMessage]] = []
+        self._counter: Iterator[int] = itertools.count()
+        self._batches: Dict[str, LineBatch] = {}
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._destination: Optional[discord.abc.Messageable] = None
+        self._task: Optional[asyncio.Task] = None
+        self.dropped: int = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = self.bot.loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker and send the messages and lines still queued."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        if self._batches:
+            self.flush_lines()
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            # The worker puts back a message it was sending, so drain only once it stopped
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await asyncio.wait_for(self._drain(), STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Discarded %s queued console messages on stop.", len(self._queue))
+
+    # ------ Queueing ------
+
+    def put(
+        self,
+        content: Optional[str] = None,
+        *,
+        embed: Optional[discord.Embed] = None,
+        priority: int = INFO,
+    ) -> None:
+        if len(self._queue) >= MAX_QUEUED:
+            # Drop the newest message of the lowest priority, possibly this one
+            worst: Tuple[int, int, ConsoleMessage] = max(self._queue)
+            self.dropped += 1
+            if (priority, next(self._counter)) > worst[:2]:
+                return
+            self._queue.remove(worst)
+            heapq.heapify(self._queue)
+        heapq.heappush(self._queue, (priority, next(self._counter), (content, embed)))
+        self._wakeup.set()
+
+    def add_line(self, title: str, line: str, *, color: discord.Color) -> None:
+        """Add a low priority line, sent with the other lines of the same title."""
+        batch: Optional[LineBatch] = self._batches.get(title)
+        if batch is None:
+            batch = self._batches[title] = LineBatch(color)
+        if len(batch.lines) < MAX_BATCH_LINES:
+            batch.lines.append(line)
+        else:
+            batch.omitted += 1
+        if self._batch_timer is None:
+            self._batch_timer = self.bot.loop.call_later(BATCH_INTERVAL, self.flush_lines)
+
+    def flush_lines(self) -> None:
+        """Queue the embeds of all collected lines."""
+        self._batch_timer = None
+        batches, self._batches = self._batches, {}
+        timestamp: datetime.datetime = datetime.datetime.utcnow()
+        for title, batch in batches.items():
+            lines: List[str] = batch.lines
+            if batch.omitted:
+                lines = lines + [f"And {batch.omitted} more."]
+            for _, _, chunk in utils.pack_lines(lines, EMBED_DESCRIPTION_LIMIT):
+                embed: discord.Embed = discord.Embed(
+                    color=batch.color, description=chunk, timestamp=timestamp
+                )
+                embed.set_author(name=title)
+                self.put(embed=embed)
+
+    # ------ Sending ------
+
+    async def get_destination(self) -> discord.abc.Messageable:
+        """Return the console channel or the owner's DM channel, resolved once."""
+        if self._destination is None:
+            try:
+                self._destination = self.bot.get_console_channel()
+            except ValueError:
+                owner: discord.User = await self.bot.fetch_owner()
+                self._destination = owner.dm_channel or await owner.create_dm()
+        return self._destination
+
+    async def _send(self, content: Optional[str], embed: Optional[discord.Embed]) -> None:
+        try:
+            destination: discord.abc.Messageable = await self.get_destination()
+            await destination.send(content, embed=embed)
+        except (discord.NotFound, discord.Forbidden) as exc:
+            # The channel may have been deleted or hidden, resolve it again next time
+            self._destination = None
+            logger.warning("Failed to send console message. (%s: %s)", type(exc).__name__, exc)
+        except (discord.HTTPException, ValueError) as exc:
+            logger.warning("Failed to send console message. (%s: %s)", type(exc).__name__, exc)
+
+    async def _drain(self) -> None:
+        while self._queue:
+            if self.dropped:
+                # Sent outside the bounded queue so the summary itself is never dropped
+                dropped, self.dropped = self.dropped, 0
+                await self._send(
+                    f"Dropped {dropped} console messages while the queue was full.", None
+                )
+            entry: Tuple[int, int, ConsoleMessage] = heapq.heappop(self._queue)
+            try:
+                await self._send(*entry[2])
+            except asyncio.CancelledError:
+                heapq.heappush(self._queue, entry)
+                raise
+
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._drain()
@@ -15,6 +15,12 @@ class Context(commands.Context):
 
     locked_authors: Dict[int, "Context"] = {}
 
+    def __init__(self, **attrs: Any) -> None:
+        super().__init__(**attrs)
+        # Seconds spent in each invocation stage, see botto.core.metrics
+        self.timings: Dict[str, float] = {}
+        self.callback_started: Optional[float] = None
+
     @property
     def session(self) -> aiohttp.ClientSession:
         return self.bot.session
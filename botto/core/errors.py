@@ -28,3 +28,7 @@ class SubcommandRequired(commands.CommandError):
 
 class NotConnectedToRestrictedApi(commands.CommandError):
     pass
+
+
+class NotConnectedToDatabase(commands.CommandError):
+    pass
@@ -0,0 +1,91 @@
+import logging
+import os
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+try:
+    import ujson as json
+except ImportError:
+    import json  # type: ignore
+
+logger = logging.getLogger("botto.gateway")  # pylint: disable=invalid-name
+
+# Saved sessions older than this are not worth trying to resume
+SESSION_MAX_AGE: float = 300.0
+
+
+def get_session_filename(path: str, cluster_id: Optional[int] = None) -> str:
+    """Return the session file of the process, or of a cluster worker if given."""
+    if cluster_id is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-cluster{cluster_id}{ext}"
+
+
+class GatewaySession(NamedTuple):
+    session_id: str
+    sequence: int
+    # Resumed sessions never receive their guilds again, so they are fetched by ID
+    guild_ids: Tuple[int, ...] = ()
+
+
+class GatewaySessionStore:
+    """Local file of gateway session IDs and sequence numbers of each shard."""
+
+    def __init__(
+        self, path: str, max_age: float = SESSION_MAX_AGE, max_guilds: Optional[int] = None
+    ) -> None:
+        self.path: str = path
+        self.max_age: float = max_age
+        self.max_guilds: Optional[int] = max_guilds
+
+    def load(self, shard_count: int) -> Dict[int, GatewaySession]:
+        """Return resumable sessions by shard ID, empty if they are stale or unusable."""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning("Gateway session file %s is corrupted, ignoring it.", self.path)
+            return {}
+
+        if data["shard_count"] != shard_count:
+            logger.info("Shard count changed since gateway sessions were saved, ignoring them.")
+            return {}
+        age: float = time.time() - data["saved_at"]
+        if age > self.max_age:
+            logger.info("Gateway sessions were saved %.0f seconds ago, ignoring them.", age)
+            return {}
+
+        sessions: Dict[int, GatewaySession] = {
+            int(shard_id): GatewaySession(
+                session["session_id"], session["sequence"], tuple(session.get("guild_ids", ()))
+            )
+            for shard_id, session in data["sessions"].items()
+        }
+        guild_count: int = sum(len(session.guild_ids) for session in sessions.values())
+        if self.max_guilds is not None and guild_count > self.max_guilds:
+            # Fetching every guild over REST would take longer than identifying
+            logger.info(
+                "Gateway sessions have %s guilds, more than %s to fetch, ignoring them.",
+                guild_count,
+                self.max_guilds,
+            )
+            return {}
+        return sessions
+
+    def save(self, shard_count: int, sessions: Dict[int, GatewaySession]) -> None:
+        data = {
+            "shard_count": shard_count,
+            "saved_at": time.time(),
+            "sessions": {
+                str(shard_id): session._asdict() for shard_id, session in sessions.items()
+            },
+        }
+        # Write to a temporary file first so a crash never leaves a partial file behind,
+        # named after the process so another one can never replace it half-written
+        temp_path: str = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import discord
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+logger = logging.getLogger("botto.interactions")  # pylint: disable=invalid-name
+
+# ("reaction", message ID, user ID) or ("message", channel ID, user ID)
+InteractionKey = Tuple[str, int, int]
+
+
+class InteractionListener:
+    """A callback registered for the reactions or messages of one user."""
+
+    __slots__ = ("key", "callback", "on_timeout", "deadline", "active")
+
+    def __init__(
+        self,
+        key: InteractionKey,
+        callback: Callable[[Any], Any],
+        on_timeout: Optional[Callable[[], Any]],
+        deadline: Optional[float],
+    ) -> None:
+        self.key: InteractionKey = key
+        self.callback: Callable[[Any], Any] = callback
+        self.on_timeout: Optional[Callable[[], Any]] = on_timeout
+        self.deadline: Optional[float] = deadline
+        self.active: bool = True
+
+
+class InteractionRouter:
+    """Route reactions and messages to the listeners waiting for them.
+
+    Unlike Client.wait_for, which runs the check of every waiter on every event, events
+    are looked up by key so each one only reaches the listeners of its message or channel
+    and user. Timeouts of all listeners share one timer handle scheduled at the earliest
+    deadline.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self._listeners: Dict[InteractionKey, List[InteractionListener]] = {}
+        self._deadlines: List[Tuple[float, int, InteractionListener]] = []
+        self._counter: Iterator[int] = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_deadline: Optional[float] = None
+
+    def __len__(self) -> int:
+        return sum(len(listeners) for listeners in self._listeners.values())
+
+    # ------ Registration ------
+
+    def add_reaction_listener(
+        self,
+        message_id: int,
+        user_id: int,
+        callback: Callable[[discord.RawReactionActionEvent], Any],
+        *,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[Callable[[], Any]] = None,
+    ) -> InteractionListener:
+        """Call callback with every reaction added or removed by a user on a message."""
+        return self._add(("reaction", message_id, user_id), callback, timeout, on_timeout)
+
+    def add_message_listener(
+        self,
+        channel_id: int,
+        user_id: int,
+        callback: Callable[[discord.Message], Any],
+        *,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[Callable[[], Any]] = None,
+    ) -> InteractionListener:
+        """Call callback with every message sent by a user in a channel."""
+        return self._add(("message", channel_id, user_id), callback, timeout, on_timeout)
+
+    def remove_listener(self, listener: InteractionListener) -> None:
+        # Entries in the deadline heap are skipped once inactive instead of being removed
+        listener.active = False
+        listeners = self._listeners.get(listener.key)
+        if listeners is None:
+            return
+        try:
+            listeners.remove(listener)
+        except ValueError:
+            return
+        if not listeners:
+            del self._listeners[listener.key]
+
+    def _add(
+        self,
+        key: InteractionKey,
+        callback: Callable[[Any], Any],
+        timeout: Optional[float],
+        on_timeout: Optional[Callable[[], Any]],
+    ) -> InteractionListener:
+        deadline: Optional[float] = None if timeout is None else self.bot.loop.time() + timeout
+        listener: InteractionListener = InteractionListener(key, callback, on_timeout, deadline)
+        self._listeners.setdefault(key, []).append(listener)
+        if deadline is not None:
+            heapq.heappush(self._deadlines, (deadline, next(self._counter), listener))
+            self._schedule_timer()
+        return listener
+
+    # ------ Waiting ------
+
+    async def wait_for_reaction(
+        self, message_id: int, user_id: int, *, timeout: float
+    ) -> discord.RawReactionActionEvent:
+        """Wait for a user to add or remove a reaction on a message."""
+        return await self._wait(("reaction", message_id, user_id), None, timeout)
+
+    async def wait_for_message(
+        self,
+        channel_id: int,
+        user_id: int,
+        *,
+        check: Optional[Callable[[discord.Message], bool]] = None,
+        timeout: float,
+    ) -> discord.Message:
+        """Wait for a user to send a message passing check in a channel."""
+        return await self._wait(("message", channel_id, user_id), check, timeout)
+
+    async def _wait(
+        self, key: InteractionKey, check: Optional[Callable[[Any], bool]], timeout: float
+    ) -> Any:
+        future: asyncio.Future = self.bot.loop.create_future()
+
+        def callback(arg: Any) -> None:
+            if not future.done() and (check is None or check(arg)):
+                future.set_result(arg)
+
+        def on_timeout() -> None:
+            if not future.done():
+                future.set_exception(asyncio.TimeoutError())
+
+        listener: InteractionListener = self._add(key, callback, timeout, on_timeout)
+        try:
+            return await future
+        finally:
+            self.remove_listener(listener)
+
+    # ------ Timeouts ------
+
+    def _schedule_timer(self) -> None:
+        if not self._deadlines:
+            return
+        deadline: float = self._deadlines[0][0]
+        if self._timer_deadline is not None and self._timer_deadline <= deadline:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_deadline = deadline
+        self._timer = self.bot.loop.call_at(deadline, self._expire)
+
+    def _expire(self) -> None:
+        self._timer = self._timer_deadline = None
+        now: float = self.bot.loop.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, listener = heapq.heappop(self._deadlines)
+            if not listener.active:
+                continue
+            self.remove_listener(listener)
+            if listener.on_timeout is not None:
+                self._run(listener.on_timeout)
+        self._schedule_timer()
+
+    # ------ Dispatching ------
+
+    def _run(self, func: Callable[..., Any], *args: Any) -> None:
+        try:
+            result: Any = func(*args)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Unhandled exception in interaction listener %r.", func)
+            return
+        if asyncio.iscoroutine(result):
+            self.bot.loop.create_task(result)
+
+    def _dispatch(self, key: InteractionKey, arg: Any) -> None:
+        listeners = self._listeners.get(key)
+        if listeners:
+            # Callbacks may remove their listener while iterating
+            for listener in tuple(listeners):
+                self._run(listener.callback, arg)
+
+    # ------ Event listeners ------
+
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
+        self._dispatch(("reaction", payload.message_id, payload.user_id), payload)
+
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent) -> None:
+        self._dispatch(("reaction", payload.message_id, payload.user_id), payload)
+
+    async def on_message(self, message: discord.Message) -> None:
+        self._dispatch(("message", message.channel.id, message.author.id), message)
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import uuid
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
+
+try:
+    import ujson as json
+except ImportError:
+    import json  # type: ignore
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+logger = logging.getLogger("botto.ipc")  # pylint: disable=invalid-name
+
+Collector = Callable[[], Awaitable[Any]]
+
+
+class ClusterClient:
+    """Connection of a cluster worker to the cluster launcher.
+
+    Messages are newline-delimited JSON objects sent over a Unix socket. The launcher
+    forwards gather requests to every cluster and replies with their collected data.
+    """
+
+    def __init__(self, bot: "Botto", cluster_id: int, socket_path: str) -> None:
+        self.bot: "Botto" = bot
+        self.cluster_id: int = cluster_id
+        self.socket_path: str = socket_path
+        self.collectors: Dict[str, Collector] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._closed: bool = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    def add_collector(self, kind: str, collector: Collector) -> None:
+        """Register a coroutine function returning this cluster's data of a kind."""
+        self.collectors[kind] = collector
+
+    def remove_collector(self, kind: str) -> None:
+        self.collectors.pop(kind, None)
+
+    async def connect(self) -> None:
+        reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        self._send({"op": "identify", "cluster_id": self.cluster_id})
+        self._read_task = self.bot.loop.create_task(self._read_loop(reader))
+        logger.info("Connected to cluster launcher.")
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._read_task:
+            self._read_task.cancel()
+        if self._writer and not self._writer.is_closing():
+            self._writer.close()
+
+    def notify_ready(self) -> None:
+        if self.is_connected:
+            self._send({"op": "ready"})
+
+    async def gather(self, kind: str, *, timeout: float = 10.0) -> Dict[int, Any]:
+        """Return data of a kind collected from every running cluster by cluster ID."""
+        if not self.is_connected:
+            raise ConnectionError("Not connected to cluster launcher.")
+        nonce: str = uuid.uuid4().hex
+        future: asyncio.Future = self.bot.loop.create_future()
+        self._pending[nonce] = future
+        try:
+            self._send({"op": "gather", "kind": kind, "nonce": nonce})
+            data: Dict[str, Any] = await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(nonce, None)
+        # JSON object keys are always strings
+        return {int(cluster_id): value for cluster_id, value in data.items()}
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        assert self._writer is not None
+        self._writer.write(json.dumps(payload).encode("utf-8") + b"\n")
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                line: bytes = await reader.readline()
+                if not line:
+                    break
+                payload: Dict[str, Any] = json.loads(line)
+                if payload["op"] == "collect":
+                    self.bot.loop.create_task(self._collect(payload))
+                elif payload["op"] == "result":
+                    future: Optional[asyncio.Future] = self._pending.get(payload["nonce"])
+                    if future is not None and not future.done():
+                        future.set_result(payload["data"])
+        finally:
+            if not self._closed:
+                logger.warning("Disconnected from cluster launcher.")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Disconnected from cluster launcher."))
+
+    async def _collect(self, payload: Dict[str, Any]) -> None:
+        collector: Optional[Collector] = self.collectors.get(payload["kind"])
+        data: Any = None
+        if collector is not None:
+            try:
+                data = await collector()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Failed to collect '%s' for cluster launcher.", payload["kind"])
+        if self.is_connected:
+            self._send({"op": "response", "nonce": payload["nonce"], "data": data})
@@ -0,0 +1,138 @@
+import asyncio
+import collections
+import time
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Optional, Tuple
+
+import discord
+from discord.shard import AutoShardedConnectionState
+
+from botto import utils  # pylint: disable=cyclic-import
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+# Messages fetched through the API are kept for a short while since they are not updated
+FETCHED_CACHE_SIZE = 128
+FETCHED_CACHE_TTL = 60.0
+
+
+class MessageCache(Deque[discord.Message]):
+    """Message deque of the connection state with an index of messages by ID.
+
+    Only the deque methods the connection state uses keep the index up to date.
+    """
+
+    def __init__(self, iterable: Iterable[discord.Message] = (), maxlen: Optional[int] = None):
+        super().__init__(maxlen=maxlen)
+        self._index: Dict[int, discord.Message] = {}
+        self.extend(iterable)
+
+    def get(self, message_id: int) -> Optional[discord.Message]:
+        return self._index.get(message_id)
+
+    # Parameters are named like those of deque
+    def append(self, x: discord.Message) -> None:
+        if self.maxlen is not None and len(self) >= self.maxlen:
+            # The deque would silently drop the oldest message
+            self.popleft()
+        super().append(x)
+        self._index[x.id] = x
+
+    def extend(self, iterable: Iterable[discord.Message]) -> None:
+        for message in iterable:
+            self.append(message)
+
+    def popleft(self) -> discord.Message:
+        message: discord.Message = super().popleft()
+        message_id: int = message.id
+        if self._index.get(message_id) is message:
+            del self._index[message_id]
+        return message
+
+    def remove(self, value: discord.Message) -> None:
+        super().remove(value)
+        self._index.pop(value.id, None)
+
+    def clear(self) -> None:
+        super().clear()
+        self._index.clear()
+
+
+class IndexedConnectionState(AutoShardedConnectionState):
+    """Connection state looking up cached messages by ID instead of scanning them."""
+
+    @property  # type: ignore
+    def _messages(self) -> Optional[MessageCache]:
+        return self._message_cache
+
+    @_messages.setter
+    def _messages(self, value: Any) -> None:
+        # The state replaces its deque when cleared and when a guild is removed
+        if value is not None and not isinstance(value, MessageCache):
+            value = MessageCache(value, maxlen=value.maxlen)
+        self._message_cache: Optional[MessageCache] = value
+
+    def _get_message(self, msg_id: int) -> Optional[discord.Message]:
+        return self._messages.get(msg_id) if self._messages is not None else None
+
+
+class MessageFetcher:
+    """Get messages from the cache, fetching them once if missing.
+
+    Concurrent fetches of the same message share one request, and fetched messages are
+    kept for FETCHED_CACHE_TTL seconds.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self._fetched: "collections.OrderedDict[int, Tuple[float, discord.Message]]" = (
+            collections.OrderedDict()
+        )
+        self._pending: Dict[int, "asyncio.Future[discord.Message]"] = {}
+
+    def get_message(self, message_id: int) -> Optional[discord.Message]:
+        message: Optional[discord.Message] = self.bot._connection._get_message(message_id)
+        if message is not None:
+            return message
+        item: Optional[Tuple[float, discord.Message]] = self._fetched.get(message_id)
+        if item is None:
+            return None
+        if time.monotonic() > item[0]:
+            del self._fetched[message_id]
+            return None
+        return item[1]
+
+    async def get_or_fetch_message(self, channel_id: int, message_id: int) -> discord.Message:
+        message: Optional[discord.Message] = self.get_message(message_id)
+        if message is not None:
+            return message
+        return await utils.coalesce(
+            self._pending, message_id, lambda: self._fetch_and_keep(channel_id, message_id)
+        )
+
+    async def _fetch_and_keep(self, channel_id: int, message_id: int) -> discord.Message:
+        message: discord.Message = await self._fetch(channel_id, message_id)
+        self._fetched[message_id] = (time.monotonic() + FETCHED_CACHE_TTL, message)
+        if len(self._fetched) > FETCHED_CACHE_SIZE:
+            self._fetched.popitem(last=False)
+        return message
+
+    async def _fetch(self, channel_id: int, message_id: int) -> discord.Message:
+        channel: Any = self.bot.get_channel(channel_id)
+        if channel is None:
+            channel = await self.bot.fetch_channel(channel_id)
+        if not isinstance(channel, discord.abc.Messageable):
+            raise discord.InvalidArgument(f"Channel {channel_id} cannot have messages.")
+        return await channel.fetch_message(message_id)
+
+    # Fetched messages are not updated by the gateway so they are dropped instead
+
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        self._fetched.pop(payload.message_id, None)
+
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        self._fetched.pop(payload.message_id, None)
+
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        for message_id in payload.message_ids:
+            self._fetched.pop(message_id, None)
@@ -0,0 +1,254 @@
+import bisect
+import collections
+import math
+from typing import TYPE_CHECKING, Any, Counter, DefaultDict, Dict, Iterable, List, Sequence, Tuple
+
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+    from .context import Context
+
+# Upper bounds in seconds of latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    math.inf,
+)
+
+# Stages of a command invocation, timed by botto.Command and Botto.invoke
+STAGES: Tuple[str, ...] = ("checks", "conversion", "callback", "total")
+
+
+class Histogram:
+    """Counts of observed values per bucket, with their sum and count."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds: Sequence[float] = bounds
+        self.counts: List[int] = [0] * len(bounds)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def average(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, fraction: float) -> float:
+        """Return the upper bound of the bucket the quantile falls in."""
+        target: float = fraction * self.count
+        running: int = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return self.bounds[-1]
+
+
+class CommandMetrics:
+    __slots__ = ("calls", "failures", "latencies")
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.failures: int = 0
+        self.latencies: Dict[str, Histogram] = {stage: Histogram() for stage in STAGES}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+class Metrics:
+    """Command counters and latency histograms of this process.
+
+    Everything is plain in-memory counters updated on the event loop, so recording
+    costs a few dictionary operations per command.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self.commands: DefaultDict[str, CommandMetrics] = collections.defaultdict(CommandMetrics)
+        self.errors: Counter[Tuple[str, str]] = collections.Counter()
+
+    def observe_command(self, ctx: "Context", total: float) -> None:
+        name: str = ctx.command.qualified_name
+        metrics: CommandMetrics = self.commands[name]
+        metrics.calls += 1
+        if ctx.command_failed:
+            metrics.failures += 1
+        for stage in ("checks", "conversion", "callback"):
+            metrics.latencies[stage].observe(ctx.timings.get(stage, 0.0))
+        metrics.latencies["total"].observe(total)
+
+    def top(self, amount: int, key: str = "calls") -> List[Tuple[str, CommandMetrics]]:
+        """Return the commands with the most calls or the highest average latency."""
+
+        def sort_key(item: Tuple[str, CommandMetrics]) -> float:
+            if key == "calls":
+                return item[1].calls
+            return item[1].latencies["total"].average
+
+        return sorted(self.commands.items(), key=sort_key, reverse=True)[:amount]
+
+    # ------ Prometheus text format ------
+
+    def render(self) -> str:
+        lines: List[str] = []
+        lines.extend(self._render_commands())
+        lines.extend(self._render_errors())
+        lines.extend(self._render_gauges())
+        lines.extend(self._render_restricted_api())
+        return "\n".join(lines) + "\n"
+
+    def _render_commands(self) -> Iterable[str]:
+        yield "# HELP botto_command_calls_total Command invocations."
+        yield "# TYPE botto_command_calls_total counter"
+        for name, metrics in self.commands.items():
+            yield f"botto_command_calls_total{_labels(command=name)} {metrics.calls}"
+
+        yield "# HELP botto_command_failures_total Command invocations that raised an error."
+        yield "# TYPE botto_command_failures_total counter"
+        for name, metrics in self.commands.items():
+            yield f"botto_command_failures_total{_labels(command=name)} {metrics.failures}"
+
+        yield "# HELP botto_command_duration_seconds Command latency by invocation stage."
+        yield "# TYPE botto_command_duration_seconds histogram"
+        for name, metrics in self.commands.items():
+            for stage, histogram in metrics.latencies.items():
+                cumulative: int = 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative += count
+                    labels: str = _labels(command=name, stage=stage, le=_format_bound(bound))
+                    yield f"botto_command_duration_seconds_bucket{labels} {cumulative}"
+                labels = _labels(command=name, stage=stage)
+                yield f"botto_command_duration_seconds_sum{labels} {histogram.sum}"
+                yield f"botto_command_duration_seconds_count{labels} {histogram.count}"
+
+    def _render_errors(self) -> Iterable[str]:
+        yield "# HELP botto_command_errors_total Command errors by exception type."
+        yield "# TYPE botto_command_errors_total counter"
+        for (name, error), count in self.errors.items():
+            yield f"botto_command_errors_total{_labels(command=name, error=error)} {count}"
+
+    def _render_gauges(self) -> Iterable[str]:
+        yield "# HELP botto_gateway_latency_seconds Heartbeat latency of each shard."
+        yield "# TYPE botto_gateway_latency_seconds gauge"
+        for shard_id, latency in self.bot.latencies:
+            if not math.isnan(latency) and not math.isinf(latency):
+                yield f"botto_gateway_latency_seconds{_labels(shard=str(shard_id))} {latency}"
+
+        yield "# HELP botto_guilds Guilds in the cache."
+        yield "# TYPE botto_guilds gauge"
+        yield f"botto_guilds {self.bot.guild_count}"
+
+        yield "# HELP botto_paginator_sessions Open interactive paginator sessions."
+        yield "# TYPE botto_paginator_sessions gauge"
+        yield f"botto_paginator_sessions {len(self.bot.paginators)}"
+
+        yield "# HELP botto_paginator_entries Entries held by open paginator sessions."
+        yield "# TYPE botto_paginator_entries gauge"
+        yield f"botto_paginator_entries {self.bot.paginators.retained_entries}"
+
+    def _render_restricted_api(self) -> Iterable[str]:
+        restricted_api = self.bot.get_cog("RestrictedApi")
+        if restricted_api is None:
+            return
+
+        yield "# HELP botto_restricted_api_calls_in_flight Calls awaiting a response."
+        yield "# TYPE botto_restricted_api_calls_in_flight gauge"
+        yield f"botto_restricted_api_calls_in_flight {restricted_api.in_flight}"
+
+        yield "# HELP botto_restricted_api_frames_total Frames received by type."
+        yield "# TYPE botto_restricted_api_frames_total counter"
+        for frame_type, count in restricted_api.frame_counts.items():
+            labels: str = _labels(type=frame_type, handled="true")
+            yield f"botto_restricted_api_frames_total{labels} {count}"
+        for frame_type, count in restricted_api.unknown_frame_counts.items():
+            labels = _labels(type=frame_type, handled="false")
+            yield f"botto_restricted_api_frames_total{labels} {count}"
+
+        yield "# HELP botto_restricted_api_traffic_total Frames, events and payload bytes."
+        yield "# TYPE botto_restricted_api_traffic_total counter"
+        for backend in restricted_api.backends:
+            for key, count in backend.traffic.items():
+                labels = _labels(backend=backend.name, kind=key)
+                yield f"botto_restricted_api_traffic_total{labels} {count}"
+
+        yield "# HELP botto_restricted_api_events_expired_total Queued events never sent."
+        yield "# TYPE botto_restricted_api_events_expired_total counter"
+        yield f"botto_restricted_api_events_expired_total {restricted_api.expired_events}"
+
+        yield from self._render_restricted_api_backends(restricted_api)
+
+        yield "# HELP botto_restricted_api_call_duration_seconds Latency of calls by event."
+        yield "# TYPE botto_restricted_api_call_duration_seconds histogram"
+        for event, histogram in restricted_api.call_latencies.items():
+            cumulative: int = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                labels = _labels(event=event, le=_format_bound(bound))
+                yield f"botto_restricted_api_call_duration_seconds_bucket{labels} {cumulative}"
+            labels = _labels(event=event)
+            yield f"botto_restricted_api_call_duration_seconds_sum{labels} {histogram.sum}"
+            yield f"botto_restricted_api_call_duration_seconds_count{labels} {histogram.count}"
+
+    @staticmethod
+    def _render_restricted_api_backends(restricted_api: Any) -> Iterable[str]:
+        yield "# HELP botto_restricted_api_backend_up Whether each backend is connected."
+        yield "# TYPE botto_restricted_api_backend_up gauge"
+        for backend in restricted_api.backends:
+            labels: str = _labels(backend=backend.name)
+            yield f"botto_restricted_api_backend_up{labels} {int(backend.is_connected)}"
+
+        yield "# HELP botto_restricted_api_backend_latency_seconds Rolling ping latency."
+        yield "# TYPE botto_restricted_api_backend_latency_seconds gauge"
+        for backend in restricted_api.backends:
+            if backend.average_latency is not None:
+                labels = _labels(backend=backend.name)
+                yield (
+                    f"botto_restricted_api_backend_latency_seconds{labels} "
+                    f"{backend.average_latency}"
+                )
+
+        yield "# HELP botto_restricted_api_backend_error_rate Rolling share of failed calls."
+        yield "# TYPE botto_restricted_api_backend_error_rate gauge"
+        for backend in restricted_api.backends:
+            labels = _labels(backend=backend.name)
+            yield f"botto_restricted_api_backend_error_rate{labels} {backend.error_rate}"
+
+        yield "# HELP botto_restricted_api_backend_outstanding Calls routed to each backend."
+        yield "# TYPE botto_restricted_api_backend_outstanding gauge"
+        for backend in restricted_api.backends:
+            labels = _labels(backend=backend.name)
+            yield f"botto_restricted_api_backend_outstanding{labels} {len(backend.outstanding)}"
+
+    # ------ Event listeners ------
+
+    async def on_command_error(self, ctx: "Context", error: Exception) -> None:
+        if isinstance(error, commands.CommandInvokeError):
+            error = error.original
+        name: str = ctx.command.qualified_name if ctx.command else ""
+        self.errors[name, type(error).__name__] += 1
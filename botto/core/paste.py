@@ -0,0 +1,314 @@
+import asyncio
+import collections
+import hashlib
+import logging
+import random
+import time
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import aiohttp
+
+from botto import config, utils  # pylint: disable=cyclic-import
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+logger = logging.getLogger("botto.paste")  # pylint: disable=invalid-name
+
+# Seconds an upload attempt may take before it counts as failed
+UPLOAD_TIMEOUT = 10.0
+# Attempts per backend and the base of the exponential delay between them in seconds
+UPLOAD_ATTEMPTS = 2
+RETRY_BASE_DELAY = 0.5
+# Consecutive failures opening a backend's circuit and seconds it stays open
+FAILURE_THRESHOLD = 3
+CIRCUIT_OPEN_TIME = 60.0
+# Seconds the preferred backend has before hedged uploads also try the next one
+HEDGE_DELAY = 2.0
+# Uploads remembered by content, pastes of some Hastebin-like services expire
+CACHE_SIZE = 128
+CACHE_TTL = 3600.0
+
+DEFAULT_BACKENDS: Tuple[str, ...] = ("hastebin", "gist")
+
+
+class Paste(NamedTuple):
+    backend: str
+    url: str
+
+
+class PasteBackend:
+    """Upload function of a paste service with its circuit breaker state."""
+
+    def __init__(
+        self,
+        name: str,
+        upload: Callable[[str, Sequence[Tuple[str, str]], Optional[str]], Awaitable[str]],
+    ) -> None:
+        self.name: str = name
+        self.upload: Callable[
+            [str, Sequence[Tuple[str, str]], Optional[str]], Awaitable[str]
+        ] = upload
+        self.failures: int = 0
+        self.open_until: float = 0.0
+        self.uploads: int = 0
+        self.errors: int = 0
+
+    @property
+    def available(self) -> bool:
+        # Once open time passed the next upload is a trial, another failure reopens it
+        return time.monotonic() >= self.open_until
+
+    def record_success(self) -> None:
+        self.uploads += 1
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.errors += 1
+        self.failures += 1
+        if self.failures >= FAILURE_THRESHOLD:
+            self.open_until = time.monotonic() + CIRCUIT_OPEN_TIME
+            logger.warning(
+                "Paste backend %s failed %s times in a row, skipping it for %s seconds.",
+                self.name,
+                self.failures,
+                CIRCUIT_OPEN_TIME,
+            )
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class PasteService:
+    """Upload text to Hastebin-like services or GitHub gists with the bot's session.
+
+    Uploads are cached by content hash so repeated identical content, such as the same
+    traceback, is only uploaded once, and identical concurrent uploads share one request.
+    Each backend is retried with exponential backoff and skipped for a while after
+    repeated failures. Hedged uploads also start the next backend if the preferred one
+    has not answered within HEDGE_DELAY, returning whichever succeeds first. They may
+    upload twice, so they are meant for callers a user is waiting on.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self.backends: Dict[str, PasteBackend] = {
+            "hastebin": PasteBackend("hastebin", self._upload_hastebin),
+            "gist": PasteBackend("gist", self._upload_gist),
+        }
+        self._cache: "collections.OrderedDict[str, Tuple[float, Paste]]" = collections.OrderedDict()
+        self._pending: Dict[str, "asyncio.Future[Optional[Paste]]"] = {}
+
+    @property
+    def configured_backends(self) -> List[str]:
+        configured: List[str] = []
+        if config["HASTEBIN_CREATE_URL"] and config["HASTEBIN_PASTE_URL"]:
+            configured.append("hastebin")
+        if config["GITHUB_TOKEN"]:
+            configured.append("gist")
+        return configured
+
+    # ------ Backends ------
+
+    async def _upload_hastebin(
+        self, content: str, files: Sequence[Tuple[str, str]], description: Optional[str]
+    ) -> str:
+        if files:
+            # Pastes are a single text, files replace content like in gists
+            content = "\n\n".join(f"--- {name} ---\n{text}" for name, text in files)
+        if description is not None:
+            content = f"{description}\n\n{content}"
+        return await utils.hastebin(
+            content,
+            create_url=config["HASTEBIN_CREATE_URL"],
+            paste_url=config["HASTEBIN_PASTE_URL"],
+            session=self.bot.session,
+        )
+
+    async def _upload_gist(
+        self, content: str, files: Sequence[Tuple[str, str]], description: Optional[str]
+    ) -> str:
+        return await utils.gist(
+            *(files or [("content.txt", content)]),
+            description=description,
+            github_token=config["GITHUB_TOKEN"],
+            session=self.bot.session,
+        )
+
+    # ------ Cache ------
+
+    @staticmethod
+    def get_key(
+        content: str,
+        files: Sequence[Tuple[str, str]],
+        description: Optional[str],
+        backends: Sequence[str],
+    ) -> str:
+        digest = hashlib.sha256()
+        for part in (description or "", content, *(part for file in files for part in file)):
+            digest.update(part.encode("utf-8"))
+            # Separate parts so different splits of the same text differ
+            digest.update(b"\0")
+        digest.update(",".join(backends).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _get_cached(self, key: str) -> Optional[Paste]:
+        item: Optional[Tuple[float, Paste]] = self._cache.get(key)
+        if item is None:
+            return None
+        created, paste = item
+        if time.monotonic() - created > CACHE_TTL:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return paste
+
+    def _set_cached(self, key: str, paste: Paste) -> None:
+        self._cache[key] = (time.monotonic(), paste)
+        self._cache.move_to_end(key)
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def forget(self, url: str) -> None:
+        """Remove cached uploads of a URL, for example after the paste was deleted."""
+        for key in [key for key, (_, paste) in self._cache.items() if paste.url == url]:
+            del self._cache[key]
+
+    # ------ Uploading ------
+
+    async def upload(
+        self,
+        content: str,
+        *,
+        files: Sequence[Tuple[str, str]] = (),
+        description: Optional[str] = None,
+        backends: Sequence[str] = DEFAULT_BACKENDS,
+        hedged: bool = False,
+    ) -> Optional[Paste]:
+        """Upload content to the first backend that succeeds, in order of preference.
+
+        Pastes are made of files if given, otherwise of content. Return None if
+        no backend is configured or all of them failed.
+        """
+        configured: List[str] = self.configured_backends
+        backends = [name for name in backends if name in configured]
+        if not backends:
+            return None
+
+        key: str = self.get_key(content, files, description, backends)
+        paste: Optional[Paste] = self._get_cached(key)
+        if paste is not None:
+            return paste
+        return await utils.coalesce(
+            self._pending,
+            key,
+            lambda: self._upload_and_keep(
+                key, content, files, description, backends, hedged=hedged
+            ),
+        )
+
+    async def _upload_and_keep(
+        self,
+        key: str,
+        content: str,
+        files: Sequence[Tuple[str, str]],
+        description: Optional[str],
+        backends: Sequence[str],
+        *,
+        hedged: bool,
+    ) -> Optional[Paste]:
+        paste: Optional[Paste]
+        if hedged:
+            paste = await self._upload_hedged(content, files, description, backends)
+        else:
+            paste = await self._upload_sequential(content, files, description, backends)
+        if paste is not None:
+            self._set_cached(key, paste)
+        return paste
+
+    async def _upload_sequential(
+        self,
+        content: str,
+        files: Sequence[Tuple[str, str]],
+        description: Optional[str],
+        backends: Sequence[str],
+    ) -> Optional[Paste]:
+        for name in backends:
+            paste: Optional[Paste] = await self._upload_to(name, content, files, description)
+            if paste is not None:
+                return paste
+        return None
+
+    async def _upload_hedged(
+        self,
+        content: str,
+        files: Sequence[Tuple[str, str]],
+        description: Optional[str],
+        backends: Sequence[str],
+    ) -> Optional[Paste]:
+        tasks: Set["asyncio.Future[Optional[Paste]]"] = set()
+        remaining: List[str] = list(backends)
+        try:
+            while remaining or tasks:
+                if remaining:
+                    tasks.add(
+                        self.bot.loop.create_task(
+                            self._upload_to(remaining.pop(0), content, files, description)
+                        )
+                    )
+                # Start the next backend early if none answered in time, or right away
+                # after one failed
+                done, tasks = await asyncio.wait(
+                    tasks,
+                    timeout=HEDGE_DELAY if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    paste: Optional[Paste] = task.result()
+                    if paste is not None:
+                        return paste
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _upload_to(
+        self,
+        name: str,
+        content: str,
+        files: Sequence[Tuple[str, str]],
+        description: Optional[str],
+    ) -> Optional[Paste]:
+        backend: PasteBackend = self.backends[name]
+        if not backend.available:
+            return None
+        for attempt in range(UPLOAD_ATTEMPTS):
+            try:
+                url: str = await asyncio.wait_for(
+                    backend.upload(content, files, description), UPLOAD_TIMEOUT
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, ValueError) as exc:
+                if attempt + 1 < UPLOAD_ATTEMPTS and is_retryable(exc):
+                    # Full jitter keeps retries of concurrent uploads apart
+                    await asyncio.sleep(random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt))
+                    continue
+                backend.record_failure()
+                logger.warning("Failed to upload to %s. (%s: %s)", name, type(exc).__name__, exc)
+                return None
+            backend.record_success()
+            return Paste(name, url)
+        return None
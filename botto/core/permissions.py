@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING, Dict
+
+import discord
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+# read_messages is an implicit requirement.
+# The fundamental permissions check wouldn't run if it didn't read a command message. (duh)
+FUNDAMENTAL_PERMISSIONS: discord.Permissions = discord.Permissions()
+FUNDAMENTAL_PERMISSIONS.update(
+    send_messages=True,
+    embed_links=True,
+    attach_files=True,
+    read_message_history=True,
+    external_emojis=True,
+    add_reactions=True,
+)
+
+
+class PermissionCache:
+    """Resolved permission bitfields of the bot in guild channels.
+
+    Entries are grouped by guild so that role and member changes can drop a whole guild
+    at once. DM channel permissions are constant and not cached.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self._guilds: Dict[int, Dict[int, int]] = {}
+
+    def get(self, channel: discord.abc.Messageable, member: discord.abc.User) -> int:
+        """Return the permission bitfield of the bot member in a channel.
+
+        Channels that are not resolved, such as the bare discord.Object channels of
+        guilds not cached yet, have no permissions.
+        """
+        if not hasattr(channel, "permissions_for"):
+            return 0
+        guild = getattr(channel, "guild", None)
+        if guild is None:
+            return channel.permissions_for(member).value  # type: ignore
+        channels = self._guilds.setdefault(guild.id, {})
+        value = channels.get(channel.id)  # type: ignore
+        if value is None:
+            value = channels[channel.id] = channel.permissions_for(member).value  # type: ignore
+        return value
+
+    def get_missing(
+        self, channel: discord.abc.Messageable, member: discord.abc.User, required: int
+    ) -> int:
+        """Return the bitfield of required permissions the bot member lacks in a channel."""
+        return required & ~self.get(channel, member)
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+
+    def invalidate_channel(self, channel: discord.abc.GuildChannel) -> None:
+        channels = self._guilds.get(channel.guild.id)
+        if channels is not None:
+            channels.pop(channel.id, None)
+
+    def clear(self) -> None:
+        self._guilds.clear()
+
+    # ------ Event listeners ------
+
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        # Permission overwrite changes come through here
+        self.invalidate_channel(after)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self.invalidate_channel(channel)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        self.invalidate_guild(after.guild.id)
+
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        self.invalidate_guild(role.guild.id)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        # This also runs for every presence update so keep the common path cheap
+        if after.id != self.bot.user.id:
+            return
+        if before._roles != after._roles:  # pylint: disable=protected-access
+            self.invalidate_guild(after.guild.id)
+
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        if before.owner_id != after.owner_id:
+            self.invalidate_guild(after.id)
+
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        # Roles and overwrites may have changed while the guild was unavailable
+        self.invalidate_guild(guild.id)
+
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.invalidate_guild(guild.id)
+
+    async def on_ready(self) -> None:
+        # Guild objects are recreated on a fresh READY
+        self.clear()
@@ -0,0 +1,130 @@
+import logging
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional
+
+import discord
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+logger = logging.getLogger("botto.prefixes")  # pylint: disable=invalid-name
+
+# Terminal marker in trie nodes, the empty string is never a single character key
+_END = ""
+
+
+class PrefixTrie:
+    """Character trie of command prefixes.
+
+    Matching walks the message content once, so it costs O(length of the longest prefix)
+    regardless of how many prefixes there are.
+    """
+
+    __slots__ = ("prefixes", "_root")
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        # Keep insertion order and drop duplicates and empty prefixes
+        self.prefixes: List[str] = list(dict.fromkeys(prefix for prefix in prefixes if prefix))
+        self._root: Dict[str, Any] = {}
+        for prefix in self.prefixes:
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[_END] = prefix
+
+    def match(self, content: str) -> Optional[str]:
+        """Return the longest prefix content starts with, otherwise return None."""
+        node: Optional[Dict[str, Any]] = self._root
+        found: Optional[str] = None
+        for char in content:
+            node = node.get(char)  # type: ignore
+            if node is None:
+                break
+            found = node.get(_END, found)
+        return found
+
+
+class PrefixManager:
+    """Per-guild command prefixes kept in memory and persisted in the database.
+
+    Guilds without custom prefixes share one trie built from the configured defaults.
+    Tries are only rebuilt when a guild changes its prefixes.
+    """
+
+    def __init__(self, bot: "Botto", default_prefixes: Iterable[str]) -> None:
+        self.bot: "Botto" = bot
+        self.default_prefixes: List[str] = list(default_prefixes)
+        self._custom_prefixes: Dict[int, List[str]] = {}
+        self._tries: Dict[Optional[int], PrefixTrie] = {}
+        self._mentions: Optional[List[str]] = None
+        self._bare_mentions: FrozenSet[str] = frozenset()
+
+    def _load_mentions(self) -> None:
+        if self._mentions is not None or self.bot.user is None:
+            return
+        self._mentions = [f"<@{self.bot.user.id}> ", f"<@!{self.bot.user.id}> "]
+        self._bare_mentions = frozenset(mention.rstrip() for mention in self._mentions)
+        # Tries built before login lack the mention prefixes
+        self._tries.clear()
+
+    @property
+    def mentions(self) -> List[str]:
+        """Mention prefixes of the bot, empty until the bot has logged in."""
+        self._load_mentions()
+        return self._mentions or []
+
+    def is_bare_mention(self, content: str) -> bool:
+        """Check if content is only a mention of the bot."""
+        self._load_mentions()
+        return content in self._bare_mentions
+
+    def get_prefixes(self, guild_id: Optional[int]) -> List[str]:
+        """Return the prefixes of a guild without mentions."""
+        if guild_id is None:
+            return self.default_prefixes
+        return self._custom_prefixes.get(guild_id, self.default_prefixes)
+
+    def get_trie(self, guild_id: Optional[int]) -> PrefixTrie:
+        """Return the compiled prefix trie of a guild, mentions included."""
+        mentions = self.mentions
+        key = guild_id if guild_id in self._custom_prefixes else None
+        trie = self._tries.get(key)
+        if trie is None:
+            trie = self._tries[key] = PrefixTrie(mentions + self.get_prefixes(key))
+        return trie
+
+    def get_message_trie(self, message: discord.Message) -> PrefixTrie:
+        return self.get_trie(message.guild.id if message.guild else None)
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """Drop the compiled trie of a guild, or every trie if no guild is given."""
+        if guild_id is None:
+            self._tries.clear()
+        else:
+            self._tries.pop(guild_id, None)
+
+    # ------ Database ------
+
+    async def load(self) -> None:
+        """Fetch all custom guild prefixes in bulk."""
+        queries = self.bot.get_queries("prefixes.sql")
+        async with self.bot.pool.acquire() as conn:
+            await conn.execute(queries.create_table())
+            records = await conn.fetch(queries.get_all_prefixes())
+        self._custom_prefixes = {record["guild_id"]: record["prefixes"] for record in records}
+        self.invalidate()
+        logger.info("Loaded custom prefixes of %s guilds.", len(self._custom_prefixes))
+
+    async def set_prefixes(self, guild_id: int, prefixes: Iterable[str]) -> None:
+        """Store custom prefixes for a guild."""
+        prefixes = list(dict.fromkeys(prefixes))
+        queries = self.bot.get_queries("prefixes.sql")
+        await self.bot.pool.execute(queries.set_prefixes(), guild_id, prefixes)
+        self._custom_prefixes[guild_id] = prefixes
+        self.invalidate(guild_id)
+
+    async def reset_prefixes(self, guild_id: int) -> None:
+        """Remove custom prefixes of a guild so it uses the default ones."""
+        queries = self.bot.get_queries("prefixes.sql")
+        await self.bot.pool.execute(queries.delete_prefixes(), guild_id)
+        self._custom_prefixes.pop(guild_id, None)
+        self.invalidate(guild_id)
@@ -0,0 +1,97 @@
+import asyncio
+import collections
+import time
+from typing import TYPE_CHECKING, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from discord.ext import tasks
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+# Seconds between samples
+SAMPLE_INTERVAL: float = 15.0
+# Number of samples kept, one hour of history
+HISTORY_SIZE: int = int(3600 / SAMPLE_INTERVAL)
+# Seconds ahead the timer measuring the loop lag is scheduled
+LAG_PROBE_DELAY: float = 0.01
+
+
+class ProcessSample(NamedTuple):
+    timestamp: float
+    cpu: float  # percent since the previous sample
+    uss: float  # MiB
+    rss: float  # MiB
+    fds: int
+    threads: int
+    loop_lag: float  # ms
+
+
+class ProcessSampler:
+    """Collect process metrics at a fixed interval and keep a ring buffer of them.
+
+    The psutil calls run in an executor since reading memory maps for the USS can block
+    for tens of milliseconds on a large heap.
+    """
+
+    def __init__(self, bot: "Botto", history_size: int = HISTORY_SIZE) -> None:
+        self.bot: "Botto" = bot
+        self.history: Deque[ProcessSample] = collections.deque(maxlen=history_size)
+        # The first call only sets the reference point of later CPU percentages
+        self.bot.process.cpu_percent()
+
+    @property
+    def latest(self) -> Optional[ProcessSample]:
+        return self.history[-1] if self.history else None
+
+    async def get_latest(self) -> ProcessSample:
+        """Return the latest sample, taking one if there is none yet."""
+        if not self.history:
+            await self.sample()
+        return self.history[-1]
+
+    def _read_process(self) -> Tuple[float, float, float, int, int]:
+        process = self.bot.process
+        with process.oneshot():
+            memory = process.memory_full_info()
+            fds: int = process.num_fds() if hasattr(process, "num_fds") else process.num_handles()
+            return (
+                process.cpu_percent(),
+                memory.uss / 2 ** 20,
+                memory.rss / 2 ** 20,
+                fds,
+                process.num_threads(),
+            )
+
+    async def _measure_loop_lag(self) -> float:
+        # How late a timer runs, which is how long scheduled callbacks wait for the loop
+        loop: asyncio.AbstractEventLoop = self.bot.loop
+        future: "asyncio.Future[float]" = loop.create_future()
+        scheduled: float = loop.time() + LAG_PROBE_DELAY
+
+        def fire() -> None:
+            if not future.done():
+                future.set_result(loop.time())
+
+        loop.call_at(scheduled, fire)
+        # Timers within the clock resolution may run slightly early
+        return max(0.0, await future - scheduled) * 1000
+
+    async def sample(self) -> ProcessSample:
+        loop_lag: float = await self._measure_loop_lag()
+        cpu, uss, rss, fds, threads = await self.bot.loop.run_in_executor(None, self._read_process)
+        sample: ProcessSample = ProcessSample(time.time(), cpu, uss, rss, fds, threads, loop_lag)
+        self.history.append(sample)
+        return sample
+
+    def summarize(self) -> Dict[str, Tuple[float, float, float]]:
+        """Return minimum, average and maximum of every metric in the history."""
+        summary: Dict[str, Tuple[float, float, float]] = {}
+        for field in ProcessSample._fields[1:]:
+            values: List[float] = [getattr(sample, field) for sample in self.history]
+            if values:
+                summary[field] = (min(values), sum(values) / len(values), max(values))
+        return summary
+
+    @tasks.loop(seconds=SAMPLE_INTERVAL)
+    async def sample_loop(self) -> None:
+        await self.sample()
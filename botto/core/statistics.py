@@ -0,0 +1,128 @@
+from typing import TYPE_CHECKING, Dict, Iterable
+
+import discord
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+KEYS = ("text_channels", "voice_channels", "members", "online", "bots")
+
+
+def count_guild(guild: discord.Guild) -> Dict[str, int]:
+    """Count cached channels and members of a guild by walking them."""
+    counts: Dict[str, int] = dict.fromkeys(KEYS, 0)
+    for channel in guild.channels:
+        if isinstance(channel, discord.TextChannel):
+            counts["text_channels"] += 1
+        elif isinstance(channel, discord.VoiceChannel):
+            counts["voice_channels"] += 1
+    for member in guild.members:
+        counts["members"] += 1
+        counts["online"] += member.status is not discord.Status.offline
+        counts["bots"] += member.bot
+    return counts
+
+
+def count_guilds(guilds: Iterable[discord.Guild]) -> Dict[str, int]:
+    totals: Dict[str, int] = dict.fromkeys(KEYS, 0)
+    for guild in guilds:
+        for key, value in count_guild(guild).items():
+            totals[key] += value
+    return totals
+
+
+class CacheStatistics:
+    """Channel and member counts of the cache kept up to date from gateway events.
+
+    Guilds are counted in full when they become available and only adjusted by
+    channel and member events afterwards, so reading the totals costs O(1).
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self._guilds: Dict[int, Dict[str, int]] = {}
+        self._totals: Dict[str, int] = dict.fromkeys(KEYS, 0)
+
+    @property
+    def totals(self) -> Dict[str, int]:
+        return dict(self._totals)
+
+    def add_guild(self, guild: discord.Guild) -> None:
+        # Guild objects are replaced on reconnects, so drop the old counts first
+        self.remove_guild(guild)
+        counts: Dict[str, int] = count_guild(guild)
+        self._guilds[guild.id] = counts
+        for key, value in counts.items():
+            self._totals[key] += value
+
+    def remove_guild(self, guild: discord.Guild) -> None:
+        counts = self._guilds.pop(guild.id, None)
+        if counts is not None:
+            for key, value in counts.items():
+                self._totals[key] -= value
+
+    def resync(self) -> None:
+        """Recount every cached guild."""
+        self._guilds.clear()
+        self._totals = dict.fromkeys(KEYS, 0)
+        for guild in self.bot.guilds:
+            self.add_guild(guild)
+
+    def _adjust(self, guild: discord.Guild, key: str, delta: int) -> None:
+        # Guilds that are not counted yet are counted in full once they are available
+        counts = self._guilds.get(guild.id)
+        if counts is not None:
+            counts[key] += delta
+            self._totals[key] += delta
+
+    def _adjust_member(self, member: discord.Member, delta: int) -> None:
+        self._adjust(member.guild, "members", delta)
+        if member.status is not discord.Status.offline:
+            self._adjust(member.guild, "online", delta)
+        if member.bot:
+            self._adjust(member.guild, "bots", delta)
+
+    @staticmethod
+    def _channel_key(channel: discord.abc.GuildChannel) -> str:
+        if isinstance(channel, discord.TextChannel):
+            return "text_channels"
+        if isinstance(channel, discord.VoiceChannel):
+            return "voice_channels"
+        return ""
+
+    # ------ Event listeners ------
+
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        self.add_guild(guild)
+
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        self.add_guild(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.remove_guild(guild)
+
+    async def on_guild_unavailable(self, guild: discord.Guild) -> None:
+        self.remove_guild(guild)
+
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        key: str = self._channel_key(channel)
+        if key:
+            self._adjust(channel.guild, key, 1)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        key: str = self._channel_key(channel)
+        if key:
+            self._adjust(channel.guild, key, -1)
+
+    async def on_member_join(self, member: discord.Member) -> None:
+        self._adjust_member(member, 1)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        self._adjust_member(member, -1)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        # Presence updates come through here as well
+        was_online: bool = before.status is not discord.Status.offline
+        is_online: bool = after.status is not discord.Status.offline
+        if was_online != is_online:
+            self._adjust(after.guild, "online", 1 if is_online else -1)
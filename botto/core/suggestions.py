@@ -0,0 +1,100 @@
+import difflib
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+# Longer input is cut before lookup so spam of huge words costs the same as short ones
+MAX_QUERY_LENGTH = 32
+# Minimum share of trigrams a name must have in common with the input to be considered
+MIN_TRIGRAM_OVERLAP = 0.2
+# Minimum similarity ratio of suggested names
+MIN_SIMILARITY = 0.6
+
+
+def trigrams(name: str) -> Set[str]:
+    """Return the trigrams of a name padded with spaces so short names have some too."""
+    padded: str = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class CommandIndex:
+    """Trigram index of command names and aliases for "did you mean" suggestions.
+
+    Every name is indexed by its trigrams, so only names sharing enough trigrams with the
+    input are compared in full instead of every command. The index is rebuilt lazily
+    when the bot's commands changed since it was built.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self._version: Optional[int] = None
+        # Indexed name -> qualified name of the command it invokes
+        self._names: Dict[str, str] = {}
+        self._postings: Dict[str, List[str]] = {}
+        self._trigram_counts: Dict[str, int] = {}
+
+    def rebuild(self) -> None:
+        names: Dict[str, str] = {}
+        for command in self.bot.walk_commands():
+            # Like the help command, never suggest what cannot be invoked
+            if command.hidden or not command.enabled:
+                continue
+            parent: str = f"{command.full_parent_name} " if command.parent else ""
+            for name in (command.name, *command.aliases):
+                names.setdefault(parent + name, command.qualified_name)
+
+        postings: Dict[str, List[str]] = {}
+        trigram_counts: Dict[str, int] = {}
+        for name in names:
+            grams: Set[str] = trigrams(name)
+            trigram_counts[name] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(name)
+
+        self._names = names
+        self._postings = postings
+        self._trigram_counts = trigram_counts
+        self._version = self.bot.commands_version
+
+    def get_candidates(self, query: str) -> List[str]:
+        """Return indexed names sharing enough trigrams with query to be compared."""
+        query_grams: Set[str] = trigrams(query)
+        shared: Dict[str, int] = {}
+        for gram in query_grams:
+            for name in self._postings.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        # Overlap relative to the larger trigram set, an upper bound of the Jaccard index
+        return [
+            name
+            for name, count in shared.items()
+            if count / max(len(query_grams), self._trigram_counts[name]) >= MIN_TRIGRAM_OVERLAP
+        ]
+
+    def suggest(self, query: str, limit: int = 3) -> List[str]:
+        """Return qualified names of up to limit commands closest to query, best first."""
+        if self._version != self.bot.commands_version:
+            self.rebuild()
+        query = " ".join(query.lower().split())[:MAX_QUERY_LENGTH]
+        if not query:
+            return []
+
+        matcher: difflib.SequenceMatcher = difflib.SequenceMatcher(b=query, autojunk=False)
+        scored: List[Tuple[float, str]] = []
+        for name in self.get_candidates(query):
+            matcher.set_seq1(name)
+            if matcher.quick_ratio() < MIN_SIMILARITY:
+                continue
+            ratio: float = matcher.ratio()
+            if ratio >= MIN_SIMILARITY:
+                scored.append((ratio, name))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        suggestions: List[str] = []
+        for _, name in scored:
+            qualified_name: str = self._names[name]
+            if qualified_name not in suggestions:
+                suggestions.append(qualified_name)
+                if len(suggestions) >= limit:
+                    break
+        return suggestions
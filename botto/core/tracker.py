@@ -0,0 +1,142 @@
+import collections
+import datetime
+import hashlib
+import logging
+import os
+import traceback
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import discord
+from discord.ext import tasks
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+logger = logging.getLogger("botto.tracker")  # pylint: disable=invalid-name
+
+# Seconds after a full report during which repeats of the same error are only counted
+DEDUP_WINDOW = 3600
+# Minutes between digests of repeated errors
+DIGEST_INTERVAL = 15
+# Fingerprints kept, the least recently seen ones are forgotten first
+MAX_FINGERPRINTS = 500
+DIGEST_LINES = 20
+
+
+def fingerprint(error: BaseException) -> str:
+    """Return a hash of an exception's type and traceback frames.
+
+    Frames are identified by file name, function and source line instead of line
+    number, so the fingerprint survives unrelated edits of the same files.
+    """
+    digest = hashlib.sha1()
+    digest.update(f"{type(error).__module__}.{type(error).__qualname__}".encode("utf-8"))
+    for frame in traceback.extract_tb(error.__traceback__):
+        digest.update(
+            f"\0{os.path.basename(frame.filename)}:{frame.name}:{frame.line}".encode("utf-8")
+        )
+    return digest.hexdigest()[:12]
+
+
+class ErrorRecord:
+    __slots__ = (
+        "fingerprint",
+        "error_type",
+        "message",
+        "command",
+        "count",
+        "unreported",
+        "first_seen",
+        "last_seen",
+        "last_reported",
+    )
+
+    def __init__(self, key: str, error: BaseException, command: Optional[str]) -> None:
+        now: datetime.datetime = datetime.datetime.utcnow()
+        self.fingerprint: str = key
+        self.error_type: str = type(error).__name__
+        self.message: str = str(error)
+        self.command: Optional[str] = command
+        self.count: int = 0
+        # Occurrences since the last full report or digest
+        self.unreported: int = 0
+        self.first_seen: datetime.datetime = now
+        self.last_seen: datetime.datetime = now
+        self.last_reported: Optional[datetime.datetime] = None
+
+
+class ErrorTracker:
+    """Group unhandled errors by fingerprint so each is reported in full once.
+
+    Repeats within DEDUP_WINDOW of the full report are counted, and the counts are sent
+    to the console channel in a digest every DIGEST_INTERVAL minutes instead.
+    """
+
+    def __init__(self, bot: "Botto") -> None:
+        self.bot: "Botto" = bot
+        self.records: "collections.OrderedDict[str, ErrorRecord]" = collections.OrderedDict()
+
+    def record(
+        self, error: BaseException, command: Optional[str] = None
+    ) -> Tuple[ErrorRecord, bool]:
+        """Count an occurrence of error, return its record and whether to report it in full."""
+        key: str = fingerprint(error)
+        record: Optional[ErrorRecord] = self.records.get(key)
+        if record is None:
+            record = self.records[key] = ErrorRecord(key, error, command)
+            if len(self.records) > MAX_FINGERPRINTS:
+                self.records.popitem(last=False)
+        else:
+            self.records.move_to_end(key)
+        now: datetime.datetime = datetime.datetime.utcnow()
+        record.count += 1
+        record.last_seen = now
+        if (
+            record.last_reported is None
+            or (now - record.last_reported).total_seconds() >= DEDUP_WINDOW
+        ):
+            record.last_reported = now
+            return record, True
+        record.unreported += 1
+        return record, False
+
+    def top(self, amount: int = 10) -> List[ErrorRecord]:
+        return sorted(self.records.values(), key=lambda record: record.count, reverse=True)[:amount]
+
+    def make_digest(self) -> Optional[discord.Embed]:
+        """Return an embed of errors repeated since the last digest and reset their counts."""
+        repeated: List[ErrorRecord] = [
+            record for record in self.records.values() if record.unreported
+        ]
+        if not repeated:
+            return None
+        repeated.sort(key=lambda record: record.unreported, reverse=True)
+        lines: List[str] = [
+            f"`{record.fingerprint}` {record.unreported}x {record.error_type} in "
+            f"'{record.command}' (first {record.first_seen:%Y-%m-%d %H:%M}, "
+            f"last {record.last_seen:%H:%M:%S})"
+            for record in repeated[:DIGEST_LINES]
+        ]
+        if len(repeated) > DIGEST_LINES:
+            lines.append(f"And {len(repeated) - DIGEST_LINES} more.")
+        embed: discord.Embed = discord.Embed(
+            color=discord.Color.orange(),
+            description="\n".join(lines),
+            timestamp=datetime.datetime.utcnow(),
+        )
+        embed.set_author(name="Repeated Exceptions Digest")
+        embed.set_footer(text=f"Times in UTC, repeats of the last {DIGEST_INTERVAL} minutes")
+        for record in repeated:
+            record.unreported = 0
+        return embed
+
+    @tasks.loop(minutes=DIGEST_INTERVAL)
+    async def digest_loop(self) -> None:
+        embed: Optional[discord.Embed] = self.make_digest()
+        if embed is None:
+            return
+        await self.bot.send_console(embed=embed)
+
+    @digest_loop.before_loop
+    async def before_digest_loop(self) -> None:
+        await self.bot.wait_until_ready()
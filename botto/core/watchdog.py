@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import TYPE_CHECKING, List, Optional
+
+from . import console
+
+if TYPE_CHECKING:
+    from .bot import Botto  # pylint: disable=cyclic-import
+
+logger = logging.getLogger("botto.watchdog")  # pylint: disable=invalid-name
+
+# Minimum seconds between stall reports sent to the console
+REPORT_COOLDOWN: float = 300.0
+# Discord message length minus room for the header and code block
+MAX_REPORT_LENGTH: int = 1900
+
+
+class LoopWatchdog:
+    """Helper thread measuring how late the event loop runs scheduled callbacks.
+
+    The thread posts a heartbeat callback to the loop and waits for it to run. When it
+    has not run after the threshold, the loop is stuck in synchronous code, so the stack
+    of the loop's thread is captured while it is still blocked.
+    """
+
+    def __init__(self, bot: "Botto", threshold: float) -> None:
+        self.bot: "Botto" = bot
+        self.threshold: float = threshold
+        self.interval: float = threshold / 2
+        self.lag: float = 0.0
+        self.stalls: int = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat: threading.Event = threading.Event()
+        self._stopped: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_report: float = 0.0
+
+    def start(self) -> None:
+        """Start watching the bot's loop, must be called from the thread that runs it."""
+        self._loop = self.bot.loop
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="botto-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._beat.set()
+
+    def _run(self) -> None:
+        assert self._loop is not None
+        while not self._stopped.wait(self.interval):
+            self._beat.clear()
+            posted: float = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(self._beat.set)
+            except RuntimeError:
+                # The loop was closed
+                return
+
+            if not self._beat.wait(self.threshold):
+                stack: List[str] = self._capture_stack()
+                self._beat.wait()
+                if self._stopped.is_set():
+                    return
+                self.lag = time.perf_counter() - posted
+                self._on_stall(stack)
+            else:
+                self.lag = time.perf_counter() - posted
+
+    def _capture_stack(self) -> List[str]:
+        if self._loop_thread_id is None:
+            return []
+        frame = sys._current_frames().get(self._loop_thread_id)  # pylint: disable=protected-access
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+
+    def _on_stall(self, stack: List[str]) -> None:
+        self.stalls += 1
+        logger.warning("Event loop was blocked for %.2f seconds at:\n%s", self.lag, "".join(stack))
+        now: float = time.monotonic()
+        if now - self._last_report < REPORT_COOLDOWN:
+            return
+        self._last_report = now
+        assert self._loop is not None
+        asyncio.run_coroutine_threadsafe(self.report(self.lag, stack), self._loop)
+
+    async def report(self, lag: float, stack: List[str]) -> None:
+        # Keep the innermost frames, those are the blocking ones
+        text: str = ""
+        for line in reversed(stack):
+            if len(text) + len(line) > MAX_REPORT_LENGTH:
+                break
+            text = line + text
+        await self.bot.send_console(
+            f"Event loop was blocked for **{lag:.2f} seconds** at:\n```py\n{text}```",
+            priority=console.ERROR,
+        )
@@ -0,0 +1,41 @@
+import logging
+import sys
+from typing import Optional
+
+
+def get_log_filename(cluster_id: Optional[int] = None, *, errors: bool = False) -> str:
+    """Return the log file name of the process, or of a cluster worker if given."""
+    name: str = "error" if errors else "botto"
+    if cluster_id is not None:
+        name += f"-cluster{cluster_id}"
+    return name + ".log"
+
+
+def setup_logging(cluster_id: Optional[int] = None) -> None:
+    """Set up stream and file handlers of the discord and botto loggers."""
+    dpy_logger: logging.Logger = logging.getLogger("discord")
+    dpy_logger.setLevel(logging.WARNING)
+    logger: logging.Logger = logging.getLogger("botto")
+    logger.setLevel(logging.INFO)
+
+    cluster: str = f"[cluster {cluster_id}] " if cluster_id is not None else ""
+    formatter: logging.Formatter = logging.Formatter(
+        "[{asctime}] [{levelname:>8}] " + cluster + "{name}: {message}", style="{"
+    )
+
+    stream_handler: logging.StreamHandler = logging.StreamHandler(sys.stdout)
+    file_handler: logging.FileHandler = logging.FileHandler(
+        filename=get_log_filename(cluster_id), encoding="utf-8", mode="w"
+    )
+    error_file_handler: logging.FileHandler = logging.FileHandler(
+        filename=get_log_filename(cluster_id, errors=True), encoding="utf-8", mode="w"
+    )
+
+    stream_handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
+    error_file_handler.setFormatter(formatter)
+    error_file_handler.setLevel(logging.ERROR)
+
+    for handler in (stream_handler, file_handler, error_file_handler):
+        dpy_logger.addHandler(handler)
+        logger.addHandler(handler)
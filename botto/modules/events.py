@@ -1,11 +1,9 @@
 import asyncio
-import datetime
 import logging
 import traceback
 from types import TracebackType
 from typing import List, Optional, Tuple, Type
 
-import aiohttp
 import discord
 from discord.ext import commands
 
@@ -14,23 +12,44 @@ import botto
 
 logger = logging.getLogger("botto.events")  # pylint: disable=invalid-name
 
+# Seconds between "did you mean" replies to the same user
+SUGGESTION_COOLDOWN = 10
+
 
 class Events(commands.Cog):
     def __init__(self, bot: botto.Botto) -> None:
         self.bot: botto.Botto = bot
+        self.suggestion_cooldown: commands.CooldownMapping = commands.CooldownMapping.from_cooldown(
+            1, SUGGESTION_COOLDOWN, commands.BucketType.user
+        )
+
+    async def suggest_commands(self, ctx: botto.Context) -> None:
+        """Reply with commands named like the unknown one, at most once per cooldown."""
+        if not ctx.invoked_with:
+            return
+        # Checked before the lookup so spam is rejected without searching the index
+        bucket: commands.Cooldown = self.suggestion_cooldown.get_bucket(ctx.message)
+        if not bucket.get_tokens():
+            return
+        if not ctx.channel.permissions_for(ctx.me).send_messages:
+            return
+        suggestions: List[str] = self.bot.command_index.suggest(ctx.invoked_with)
+        if not suggestions:
+            return
+        bucket.update_rate_limit()
+        await ctx.reply(
+            "Did you mean " + " or ".join(f"`{ctx.prefix}{name}`" for name in suggestions) + "?"
+        )
 
     @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        mentions: List[str] = [f"<@{self.bot.user.id}>", f"<@!{self.bot.user.id}>"]
-        if (
-            message.author.bot
-            or message.content not in mentions
-            or not message.channel.permissions_for(self.bot.user).send_messages
-        ):
+    async def on_bare_mention(self, message: discord.Message) -> None:
+        bot_user: discord.abc.User = message.guild.me if message.guild else self.bot.user
+        if not message.channel.permissions_for(bot_user).send_messages:
             return
-        # Note: Change this if not using commands.when_mentioned_or(*prefixes).
-        if botto.config["PREFIXES"]:
-            prefixes = botto.config["PREFIXES"]
+        prefixes: List[str] = self.bot.prefixes.get_prefixes(
+            message.guild.id if message.guild else None
+        )
+        if prefixes:
             content = (
                 f"My commands prefixes are {self.bot.user.mention} and "
                 f"`{prefixes[0]}`. Commands can be viewed using the "
@@ -50,23 +69,15 @@ class Events(commands.Cog):
     async def on_guild_join(self, guild: discord.Guild) -> None:
         line = f"Joined guild named '{guild}' (ID: {guild.id})."
         logger.info(line)
-        embed: discord.Embed = discord.Embed(
-            color=discord.Color.green(),
-            timestamp=datetime.datetime.utcnow(),
-            description=line,
-        )
-        await self.bot.send_console(embed=embed)
+        # Batched since waves of joins or removals would flood the console
+        self.bot.console.add_line("Joined Guilds", line, color=discord.Color.green())
 
     @commands.Cog.listener()
     async def on_guild_remove(self, guild: discord.Guild) -> None:
         line = f"Removed from guild named '{guild}' (ID: {guild.id})."
         logger.info(line)
-        embed: discord.Embed = discord.Embed(
-            color=discord.Color.gold(),
-            timestamp=datetime.datetime.utcnow(),
-            description=line,
-        )
-        await self.bot.send_console(embed=embed)
+        # Batched since waves of joins or removals would flood the console
+        self.bot.console.add_line("Left Guilds", line, color=discord.Color.gold())
 
     @commands.Cog.listener()
     async def on_command(self, ctx: botto.Context) -> None:
@@ -76,19 +87,13 @@ class Events(commands.Cog):
     async def on_restricted_api_event_handler_error(
         self, event_method: str, payload: dict, error: Exception
     ) -> None:
-        message: Optional[discord.Message] = discord.utils.get(
-            self.bot.cached_messages, id=payload["ctx"]["message"]["id"]
-        )
-        if message is None:
-            channel: botto.utils.OptionalChannel = self.bot.get_channel(
-                payload["ctx"]["channel"]["id"]
+        message: Optional[discord.Message] = None
+        try:
+            message = await self.bot.get_or_fetch_message(
+                payload["ctx"]["channel"]["id"], payload["ctx"]["message"]["id"]
             )
-            if channel is not None:
-                assert isinstance(channel, (discord.DMChannel, discord.TextChannel))
-                try:
-                    message = await channel.fetch_message(payload["ctx"]["message"]["id"])
-                except discord.HTTPException:
-                    pass
+        except (discord.HTTPException, discord.InvalidArgument):
+            pass
 
         if message:
             ctx: botto.Context = await self.bot.get_context(message, cls=botto.Context)
@@ -142,10 +147,10 @@ class Events(commands.Cog):
         if isinstance(error, botto.SubcommandRequired):
             help_command = self.bot.help_command.copy()
             help_command.context = ctx
-            await ctx.reply(
-                "Please use one of the subcommands listed below.",
-                embed=await help_command.get_command_help(ctx.command),
-            )
+            embeds = await help_command.get_command_help(ctx.command)
+            await ctx.reply("Please use one of the subcommands listed below.", embed=embeds[0])
+            for extra_embed in embeds[1:]:
+                await ctx.reply(embed=extra_embed)
             return
 
         if isinstance(error, commands.MissingRequiredArgument):
@@ -192,11 +197,15 @@ class Events(commands.Cog):
             if botto.utils.is_bad_message_ref_err(error):
                 return
 
-        if isinstance(error, botto.NotConnectedToRestrictedApi):
+        if isinstance(error, (botto.NotConnectedToRestrictedApi, botto.NotConnectedToDatabase)):
             await ctx.reply("This command is currently unavailable. Please try again later.")
             return
 
-        ignored = (commands.CommandNotFound, discord.Forbidden)
+        if isinstance(error, commands.CommandNotFound):
+            await self.suggest_commands(ctx)
+            return
+
+        ignored = (discord.Forbidden,)
 
         if isinstance(error, ignored):
             return
@@ -206,7 +215,17 @@ class Events(commands.Cog):
             error,
             error.__traceback__,
         )
-        if restricted_api_event:
+        record, report = self.bot.error_tracker.record(error, str(ctx.command))
+        if not report:
+            # Repeats are counted for the digest instead of being reported again
+            logger.error(
+                "Repeated exception %s in '%s' command. (%s: %s)",
+                record.fingerprint,
+                ctx.command,
+                type(error).__name__,
+                error,
+            )
+        elif restricted_api_event:
             logger.error(
                 "Unhandled exception in restricted API handler '%s' of command '%s'. (%s: %s)",
                 restricted_api_event,
@@ -241,22 +260,23 @@ class Events(commands.Cog):
         except discord.HTTPException:
             pass
 
+        if not report:
+            return
+
         # Log error to console channel
         full_tb: str = "".join(traceback.format_exception(*exc_info))
-        hastebin_url: Optional[str]
-        try:
-            hastebin_url = await botto.utils.hastebin(full_tb, session=self.bot.session)
-        except aiohttp.ClientResponseError:
-            hastebin_url = "Failed to create hastebin."
-        except ValueError:
-            hastebin_url = None
+        paste_url: Optional[str] = None
+        if self.bot.pastes.configured_backends:
+            # Identical tracebacks are only uploaded once while cached
+            paste: Optional[botto.Paste] = await self.bot.pastes.upload(full_tb)
+            paste_url = paste.url if paste else "Failed to upload traceback."
 
         partial_tb: str = "".join(traceback.format_exception(*exc_info, limit=5))
         embed = discord.Embed(
             color=discord.Color.red(),
             description=(
                 f"```py\n{botto.utils.limit_str(partial_tb, 1900)}\n```"
-                + (f"\nFull traceback: {hastebin_url}" if hastebin_url else "")
+                + (f"\nFull traceback: {paste_url}" if paste_url else "")
             ),
             timestamp=ctx.message.created_at,
         )
@@ -265,11 +285,13 @@ class Events(commands.Cog):
             embed.set_footer(
                 text=(
                     f"From restricted API handler '{restricted_api_event}' "
-                    f"of command '{ctx.command}'"
+                    f"of command '{ctx.command}' | Fingerprint {record.fingerprint}"
                 )
             )
         else:
-            embed.set_footer(text=f"From command '{ctx.command}'")
+            embed.set_footer(
+                text=f"From command '{ctx.command}' | Fingerprint {record.fingerprint}"
+            )
         embed.add_field(
             name="Command Caller",
             value=f"{ctx.author} `({ctx.author.id})`",
@@ -296,7 +318,7 @@ class Events(commands.Cog):
             inline=False,
         )
 
-        await self.bot.send_console(embed=embed)
+        await self.bot.send_console(embed=embed, priority=botto.core.console.ERROR)
 
 
 def setup(bot: botto.Botto) -> None:
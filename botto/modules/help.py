@@ -1,5 +1,7 @@
+import collections
 import inspect
-from typing import Any, Dict, List, Optional
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import discord
 from discord.ext import commands
@@ -9,12 +11,65 @@ import botto
 
 BotMapping = Dict[Optional[commands.Cog], List[commands.Command]]
 
+# Rendered help kept for the most recent prefix and command combinations
+HELP_CACHE_SIZE = 256
+
 
 class HelpCommand(commands.HelpCommand):
+    # Help commands are copied for every invocation so caches are shared by the class
+    _embed_cache: "collections.OrderedDict[Tuple[Any, ...], Any]" = collections.OrderedDict()
+    _embed_cache_version: Optional[int] = None
+    _cog_metadata: "weakref.WeakKeyDictionary[commands.Cog, Any]" = weakref.WeakKeyDictionary()
+
     def __init__(self, **options: Any) -> None:
         self.color = options.pop("color", discord.Embed.Empty)
         super().__init__(**options)
 
+    async def get_cached(self, key: Tuple[Any, ...], make: Callable[[], Awaitable[Any]]) -> Any:
+        """Return rendered help from the cache, rendering it with make if missing.
+
+        Help only looks the same for everyone if checks are not verified, otherwise it
+        is rendered every time. Results must not be modified.
+        """
+        if self.verify_checks is not False:
+            return await make()
+
+        cache = HelpCommand._embed_cache
+        version: int = self.context.bot.commands_version
+        if HelpCommand._embed_cache_version != version:
+            cache.clear()
+            HelpCommand._embed_cache_version = version
+
+        key = (self.clean_prefix, self.invoked_with) + key
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+
+        result = await make()
+        if result:
+            cache[key] = result
+            if len(cache) > HELP_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+
+    def get_cog_metadata(self, cog: commands.Cog) -> Any:
+        """Return the YAML of the cog docstring with the cog substituted, parsed once."""
+        try:
+            return HelpCommand._cog_metadata[cog]
+        except KeyError:
+            docstring = inspect.getdoc(cog)
+            metadata = yaml.full_load(docstring.format(cog=cog)) if docstring else None
+            HelpCommand._cog_metadata[cog] = metadata
+            return metadata
+
+    @staticmethod
+    def get_command_metadata(command: commands.Command) -> Any:
+        if isinstance(command, botto.Command):
+            return command.help_metadata
+        docstring = inspect.getdoc(command.callback)
+        return yaml.full_load(docstring.format(command=command)) if docstring else None
+
     async def filter_commands(
         self, cmds, *, sort=False, key=None
     ):  # pylint: disable=arguments-differ
@@ -22,41 +77,27 @@ class HelpCommand(commands.HelpCommand):
         cmds = await super().filter_commands(cmds, sort=sort, key=key)
         return [command for command in cmds if command.enabled]
 
+    def get_command_line(self, command: commands.Command) -> str:
+        return f"`{self.clean_prefix}{command}` — {command.short_doc}"
+
     async def get_bot_help(self, mapping: BotMapping) -> List[discord.Embed]:
-        embeds: List[discord.Embed] = []
-        last_embed = None
-        last_cog = None
-        last_content = None
+        return await self.get_cached(("bot",), lambda: self.make_bot_help(mapping))
+
+    async def make_bot_help(self, mapping: BotMapping) -> List[discord.Embed]:
+        packer = botto.utils.EmbedPacker(lambda: discord.Embed(color=self.color))
         for cog, cmds in mapping.items():
             cmds = await self.filter_commands(cmds)
             if not cog or not cmds:
                 continue
-            if last_embed is None:
-                embed = discord.Embed(color=self.color)
-            else:
-                embed = last_embed
-            if last_content:
-                embed.add_field(name=last_cog, value=last_content, inline=False)
-                last_cog = None
-                last_content = None
-            content = "\n".join(f"`{self.clean_prefix}{cmd}` — {cmd.short_doc}" for cmd in cmds)
-            if len(content) > 1024:
+            content = "\n".join(self.get_command_line(cmd) for cmd in cmds)
+            if len(content) > botto.utils.FIELD_VALUE_LIMIT:
                 content = (
                     f"There are {len(cmds)} commands available. Type "
                     f"`{self.clean_prefix}{self.invoked_with} {cog.qualified_name}` "
                     f"to learn more."
                 )
-            before = embed.copy()
-            embed.add_field(name=cog.qualified_name, value=content, inline=False)
-            if len(embed) > 6000:
-                embeds.append(before)
-                last_embed = None
-                last_cog = cog.qualified_name
-                last_content = content
-            else:
-                last_embed = embed
-        embeds.append(last_embed)
-        return embeds
+            packer.add_field(cog.qualified_name, content)
+        return packer.embeds or [packer.new_embed()]
 
     async def send_bot_help(self, mapping: BotMapping) -> List[discord.Message]:
         messages = []
@@ -67,13 +108,11 @@ class HelpCommand(commands.HelpCommand):
         return messages
 
     async def make_cog_embed(self, cog: commands.Cog) -> Optional[discord.Embed]:
-        docstring = inspect.getdoc(cog)
-        if not docstring:
-            return None
-        items = yaml.full_load(docstring.format(cog=cog))  # value substitution
+        items = self.get_cog_metadata(cog)  # value substitution
         if not isinstance(items, dict):
             # For docstrings without format (eg. third party commands like jishaku)
             return None
+        items = dict(items)
         embed = discord.Embed(
             color=items.pop("color", self.color),
             description=items.pop("description", "No description available."),
@@ -91,16 +130,20 @@ class HelpCommand(commands.HelpCommand):
         return embed
 
     async def get_cog_help(self, cog: commands.Cog) -> List[discord.Embed]:
-        """Return one or two embeds for cog help in a list.
+        if hasattr(cog, "_help_embed_func"):
+            # Custom help embeds may change between calls
+            return await self.make_cog_help(cog)
+        return await self.get_cached(("cog", cog.qualified_name), lambda: self.make_cog_help(cog))
+
+    async def make_cog_help(self, cog: commands.Cog) -> List[discord.Embed]:
+        """Return embeds for cog help in a list.
 
         First embed is the cog's help embed (or formatted docstring) if any.
         If there is enough space, all commands will be in the first embed.
-        Otherwise, second embed is all commands.
+        Otherwise, the following embeds are all commands.
 
-        If the docstring is unformatted, one embed will be returned.
+        If the docstring is unformatted, commands start in the first embed.
         Its description will be the cog description, fields are all commands.
-
-        Assumption: Second or only embed's total character count does not exceed 6000.
         """
         embeds: List[discord.Embed] = []
         if hasattr(cog, "_help_embed_func"):
@@ -115,50 +158,24 @@ class HelpCommand(commands.HelpCommand):
             error = self.command_not_found(cog.qualified_name)
             await self.send_error_message(error)
             return []
-        if embeds:
-            before = embed.copy()
-        else:
-            embed = discord.Embed(
-                color=self.color, description=cog.description or discord.Embed.Empty
-            )
-            embed.set_author(name=cog.qualified_name)
 
-        self.add_command_fields(cmds, embed)
-        if len(embed) > 6000 and embeds:
-            embeds[0] = before
+        def make_commands_embed() -> discord.Embed:
             embed = discord.Embed(
-                color=before.color, description=cog.description or discord.Embed.Empty
+                color=embeds[0].color if embeds else self.color,
+                description=cog.description or discord.Embed.Empty,
             )
             embed.set_author(name=cog.qualified_name)
-            self.add_command_fields(cmds, embed)
-            embeds.append(embed)
-        elif not embeds:
-            embeds.append(embed)
-        return embeds
-
-    def add_command_fields(self, cmds: List[commands.Command], embed: discord.Embed) -> None:
-        last_start_index = 0
-        last_content: List[str] = []
-        for i, cmd in enumerate(cmds):
-            content = f"`{self.clean_prefix}{cmd}` — {cmd.short_doc}"
-            if len("\n".join(last_content + [content])) <= 1024:
-                last_content.append(content)
-            else:
-                embed.add_field(
-                    name=f"Commands ({last_start_index + 1}-{i}/{len(cmds)})",
-                    value="\n".join(last_content),
-                    inline=False,
-                )
-                last_start_index = i
-                last_content = [content]
-            if i == len(cmds) - 1 and last_start_index == 0:
-                embed.add_field(name="Commands", value="\n".join(last_content), inline=False)
-            elif i == len(cmds) - 1:
-                embed.add_field(
-                    name=f"Commands ({last_start_index + 1}-{i + 1}/{len(cmds)})",
-                    value="\n".join(last_content),
-                    inline=False,
-                )
+            return embed
+
+        fields = botto.utils.numbered_fields(
+            "Commands", (self.get_command_line(cmd) for cmd in cmds)
+        )
+        packer = botto.utils.EmbedPacker(make_commands_embed, embeds[0] if embeds else None)
+        if not packer.fits(botto.utils.fields_length(fields), len(fields)):
+            # Keep all commands together after the cog's help embed
+            packer.new_embed()
+        packer.add_fields(fields)
+        return packer.embeds
 
     async def send_cog_help(self, cog: commands.Cog) -> List[discord.Message]:
         # cog cannot be None apparently
@@ -169,89 +186,103 @@ class HelpCommand(commands.HelpCommand):
             messages.append(msg)
         return messages
 
-    async def make_command_embed(self, command: commands.Command) -> discord.Embed:
+    async def make_command_embed(
+        self, command: commands.Command
+    ) -> Tuple[discord.Embed, List[Tuple[str, str, bool]]]:
+        """Return the command's help embed without fields and its (name, value, inline) fields.
+
+        Fields are left to the caller so that they can be packed within the embed limits.
+        """
+        signature = f"{self.clean_prefix}{command} {command.signature}"
+        fields: List[Tuple[str, str, bool]] = []
         docstring = inspect.getdoc(command.callback)
-        if not docstring:
-            embed = discord.Embed(color=self.color, description="No description available.")
-            embed.set_author(name=f"{self.clean_prefix}{command} {command.signature}")
-            if command.aliases:
-                embed.add_field(name="Aliases", value=" // ".join(command.aliases), inline=False)
-            return embed
-        items = yaml.full_load(docstring.format(command=command))  # value substitution
+        items = self.get_command_metadata(command) if docstring else None  # value substitution
+        add_aliases = True
         if not isinstance(items, dict):
-            # For docstrings without format (eg. third party commands like jishaku)
-            embed = discord.Embed(color=self.color, description=docstring)
-            embed.set_author(name=f"{self.clean_prefix}{command} {command.signature}")
-            if command.aliases:
-                embed.add_field(name="Aliases", value=" // ".join(command.aliases), inline=False)
+            # No docstring, or a docstring without format (eg. third party commands like jishaku)
+            embed = discord.Embed(
+                color=self.color, description=docstring or "No description available."
+            )
+            embed.set_author(name=signature)
         else:
+            items = dict(items)
             embed = discord.Embed(
                 color=items.pop("color", self.color),
                 description=items.pop("description", "No description available."),
             )
-            embed.set_author(
-                name=items.pop("name", f"{self.clean_prefix}{command} {command.signature}")
-            )
+            embed.set_author(name=items.pop("name", signature))
             embed.set_footer(text=items.pop("footer", discord.Embed.Empty))
             embed.set_thumbnail(url=items.pop("thumbnail", ""))
             embed.set_image(url=items.pop("image", ""))
             items.pop("short", None)
+            add_aliases = items.pop("add_aliases", True)
             for key, value in items.items():
                 inline = key.endswith(" (inline)")
                 if inline:
                     key = key[:-9]
-                embed.add_field(name=key, value=value, inline=inline)
-            if command.aliases and items.pop("add_aliases", True):
-                embed.add_field(name="Aliases", value=" // ".join(command.aliases), inline=False)
-        return embed
+                fields.append((key, str(value), inline))
+        embed.description = embed.description[: botto.utils.DESCRIPTION_LIMIT]
+        embed.set_author(name=embed.author.name[: botto.utils.AUTHOR_NAME_LIMIT])
+        if command.aliases and add_aliases:
+            fields.append(("Aliases", " // ".join(command.aliases), False))
+        return embed, fields
 
-    async def get_command_help(self, command: commands.Command) -> discord.Embed:
-        """Return one embed for command help.
+    async def get_command_help(self, command: commands.Command) -> List[discord.Embed]:
+        if getattr(command, "_help_embed_func", False):
+            # Custom help embeds may change between calls
+            return await self.make_command_help(command)
+        return await self.get_cached(
+            ("command", command.qualified_name), lambda: self.make_command_help(command)
+        )
+
+    async def make_command_help(self, command: commands.Command) -> List[discord.Embed]:
+        """Return embeds for command help in a list.
 
-        Assumption: Embed's total character count does not exceed 6000.
+        The first embed is the command's help embed. Fields that do not fit into it,
+        including the subcommand list, continue in embeds with the same author.
         """
+        fields: List[Tuple[str, str, bool]] = []
         if getattr(command, "_help_embed_func", False):
             embed = await command.get_help_embed(self)
         else:
-            embed = await self.make_command_embed(command)
-        if not isinstance(command, commands.Group):
-            return embed
+            embed, fields = await self.make_command_embed(command)
 
-        # Subcommand list handling
-        cmds = await self.filter_commands(command.commands)
-        last_start_index = 0
-        last_content: List[str] = []
-        for i, cmd in enumerate(cmds):
-            content = f"`{self.clean_prefix}{cmd}` — {cmd.short_doc}"
-            if len("\n".join(last_content + [content])) <= 1024:
-                last_content.append(content)
-            else:
-                embed.add_field(
-                    name=f"Subcommands ({last_start_index + 1}-{i}/{len(cmds)})",
-                    value="\n".join(last_content),
-                    inline=False,
-                )
-                last_start_index = i
-                last_content = [content]
-            if i == len(cmds) - 1 and last_start_index == 0:
-                embed.add_field(name="Subcommands", value="\n".join(last_content), inline=False)
-            elif i == len(cmds) - 1:
-                embed.add_field(
-                    name=f"Subcommands ({last_start_index + 1}-{i + 1}/{len(cmds)})",
-                    value="\n".join(last_content),
-                    inline=False,
+        def make_continued_embed() -> discord.Embed:
+            continued = discord.Embed(color=embed.color)
+            if embed.author.name:
+                continued.set_author(name=embed.author.name)
+            return continued
+
+        packer = botto.utils.EmbedPacker(make_continued_embed, embed)
+        for name, value, inline in fields:
+            packer.add_field(name, value, inline=inline)
+        if isinstance(command, commands.Group):
+            # Subcommand list handling
+            cmds = await self.filter_commands(command.commands)
+            packer.add_fields(
+                botto.utils.numbered_fields(
+                    "Subcommands", (self.get_command_line(cmd) for cmd in cmds)
                 )
-        return embed
+            )
+        return packer.embeds
 
-    async def send_command_help(self, command: commands.Command) -> discord.Message:
-        embed = await self.get_command_help(command)
-        return await self.context.reply(embed=embed)
+    async def send_command_help(self, command: commands.Command) -> List[discord.Message]:
+        messages = []
+        embeds = await self.get_command_help(command)
+        for embed in embeds:
+            msg = await self.context.reply(embed=embed)
+            messages.append(msg)
+        return messages
 
-    async def send_group_help(self, group: commands.Group) -> discord.Message:
+    async def send_group_help(self, group: commands.Group) -> List[discord.Message]:
         return await self.send_command_help(group)
 
     def command_not_found(self, string: str) -> str:
-        return f"No command called `{string}` found."
+        suggestions: List[str] = self.context.bot.command_index.suggest(string)
+        if not suggestions:
+            return f"No command called `{string}` found."
+        names = " or ".join(f"`{name}`" for name in suggestions)
+        return f"No command called `{string}` found. Did you mean {names}?"
 
     def subcommand_not_found(self, command: commands.Command, string: str) -> str:
         if isinstance(command, commands.Group) and command.all_commands:
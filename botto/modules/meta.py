@@ -1,19 +1,83 @@
+import asyncio
 import platform
 import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import discord
 from discord.ext import commands
 
 import botto
 
+MAX_PREFIXES = 10
+MAX_PREFIX_LENGTH = 32
+
 
 class Meta(commands.Cog):
     """Meta commands related to the bot."""
 
     def __init__(self, bot: botto.Botto) -> None:
         self.bot: botto.Botto = bot
+        if self.bot.cluster:
+            self.bot.cluster.add_collector("statistics", self.collect_statistics)
+            self.bot.cluster.add_collector("latency", self.collect_latency)
+
+    def cog_unload(self) -> None:
+        if self.bot.cluster:
+            self.bot.cluster.remove_collector("statistics")
+            self.bot.cluster.remove_collector("latency")
+
+    def get_local_statistics(self) -> Dict[str, Any]:
+        """Return statistics of this process to be combined with those of other clusters."""
+        stats: Dict[str, Any] = {"guilds": self.bot.guild_count, "latency": self.bot.ping}
+
+        counts: Dict[str, int] = self.bot.cache_statistics.totals
+        if botto.config["INTENTS"]["GUILDS"]:
+            stats["text_channels"] = counts["text_channels"]
+            stats["voice_channels"] = counts["voice_channels"]
+
+        if botto.config["INTENTS"]["MEMBERS"]:
+            stats["members"] = counts["members"]
+            stats["users"] = self.bot.user_count
+            if botto.config["INTENTS"]["PRESENCES"]:
+                stats["online"] = counts["online"]
+            else:
+                stats["bots"] = counts["bots"]
+
+        sample: Optional[botto.ProcessSample] = self.bot.sampler.latest
+        if sample is not None:
+            stats["cpu"] = sample.cpu
+            stats["ram"] = sample.uss
+
+        return stats
+
+    async def collect_statistics(self) -> Dict[str, Any]:
+        await self.bot.sampler.get_latest()
+        return self.get_local_statistics()
+
+    async def collect_latency(self) -> Dict[str, Any]:
+        return {"latency": self.bot.ping, "shards": self.bot.shard_ids or [0]}
+
+    async def gather_from_clusters(self, kind: str) -> Dict[int, Dict[str, Any]]:
+        """Return data of a kind from every cluster, or only this process if not clustered."""
+        collector: Callable[[], Awaitable[Dict[str, Any]]] = {
+            "statistics": self.collect_statistics,
+            "latency": self.collect_latency,
+        }[kind]
+        if self.bot.cluster:
+            try:
+                data = await self.bot.cluster.gather(kind)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+            else:
+                return {cluster_id: value for cluster_id, value in data.items() if value}
+        return {self.bot.cluster_id or 0: await collector()}
+
+    async def get_statistics_embed(self) -> discord.Embed:
+        clusters: Dict[int, Dict[str, Any]] = await self.gather_from_clusters("statistics")
+
+        def total(key: str) -> Any:
+            return sum(stats.get(key, 0) for stats in clusters.values())
 
-    def get_statistics_embed(self) -> discord.Embed:
         embed: discord.Embed = discord.Embed(
             color=botto.config["MAIN_COLOR"], timestamp=datetime.datetime.utcnow()
         )
@@ -21,47 +85,29 @@ class Meta(commands.Cog):
 
         # Guild Stats field (optional)
         if botto.config["INTENTS"]["GUILDS"]:
-            total_guilds: int = self.bot.guild_count
-            text_channels: int = sum(
-                1
-                for channel in self.bot.get_all_channels()
-                if isinstance(channel, discord.TextChannel)
-            )
-            voice_channels: int = sum(
-                1
-                for channel in self.bot.get_all_channels()
-                if isinstance(channel, discord.VoiceChannel)
-            )
             embed.add_field(
                 name="Guild Stats",
                 value=(
-                    f"{total_guilds} guilds\n"
-                    f"{text_channels} text channels\n"
-                    f"{voice_channels} voice channels"
+                    f"{total('guilds')} guilds\n"
+                    f"{total('text_channels')} text channels\n"
+                    f"{total('voice_channels')} voice channels"
                 ),
             )
 
         # Member Stats field (optional)
         if botto.config["INTENTS"]["MEMBERS"]:
-            total_members: int = sum(1 for m in self.bot.get_all_members())
-            total_users: int = self.bot.user_count
             extra_user_info: str
             if botto.config["INTENTS"]["PRESENCES"]:
-                total_online: int = len(
-                    {
-                        m
-                        for m in self.bot.get_all_members()
-                        if m.status is not discord.Status.offline
-                    }
-                )
-                extra_user_info = f"{total_online} users online"
+                extra_user_info = f"{total('online')} users online"
             else:
-                total_bots: int = len({m for m in self.bot.get_all_members() if not m.bot})
-                extra_user_info = f"incl. {total_bots} bots"
+                extra_user_info = f"incl. {total('bots')} bots"
+            # Users seen by several clusters are counted once per cluster
+            users_info: str = "unique users" if len(clusters) == 1 else "users across clusters"
             embed.add_field(
                 name="Member Stats",
                 value=(
-                    f"{total_members} total members\n{total_users} unqiue users\n{extra_user_info}"
+                    f"{total('members')} total members\n{total('users')} {users_info}\n"
+                    f"{extra_user_info}"
                 ),
             )
 
@@ -80,31 +126,59 @@ class Meta(commands.Cog):
         )
 
         # Discord connection field
-        embed.add_field(name="Discord", value=f"{self.bot.ping} ms latest")
+        if len(clusters) == 1:
+            embed.add_field(name="Discord", value=f"{self.bot.ping} ms latest")
+        else:
+            embed.add_field(
+                name="Discord", value=f"{round(total('latency') / len(clusters))} ms average"
+            )
 
         # Restricted API connection field (optional)
         if self.bot.restricted_api_ping:
-            embed.add_field(name="Internal API", value=f"{self.bot.restricted_api_ping} ms latest")
+            kind: str = "average" if len(self.bot.restricted_api_pings) > 1 else "latest"
+            embed.add_field(name="Internal API", value=f"{self.bot.restricted_api_ping} ms {kind}")
 
         # Process stats field
-        with self.bot.process.oneshot():
-            cpu_usage: float = self.bot.process.cpu_percent()
-            ram_usage: float = self.bot.process.memory_full_info().uss / 2 ** 20
-        embed.add_field(name="Process", value=f"{cpu_usage}% CPU\n{ram_usage:.2f} MiB")
+        embed.add_field(name="Process", value=f"{total('cpu')}% CPU\n{total('ram'):.2f} MiB")
+
+        # Clusters field (optional)
+        if len(clusters) > 1:
+            embed.add_field(
+                name="Clusters",
+                value="\n".join(
+                    f"#{cluster_id}: {stats['guilds']} guilds, {stats['latency']} ms, "
+                    f"{stats['ram']:.2f} MiB"
+                    for cluster_id, stats in sorted(clusters.items())
+                ),
+                inline=False,
+            )
 
         return embed
 
     @botto.command()
     async def botstats(self, ctx: botto.Context) -> None:
         """Show general statistics of the bot."""
-        embed: discord.Embed = self.get_statistics_embed()
+        embed: discord.Embed = await self.get_statistics_embed()
         await ctx.reply(embed=embed)
 
     @botto.command()
     async def ping(self, ctx: botto.Context) -> None:
         """Show connection statistics of the bot."""
         text: str = f"Discord pong: **{self.bot.ping} ms**"
-        if self.bot.restricted_api_ping:
+        if self.bot.cluster:
+            clusters: Dict[int, Dict[str, Any]] = await self.gather_from_clusters("latency")
+            for cluster_id, data in sorted(clusters.items()):
+                text += (
+                    f"\nCluster #{cluster_id} (shards {data['shards'][0]}-{data['shards'][-1]}) "
+                    f"pong: **{data['latency']} ms**"
+                )
+        pings: Dict[str, Optional[int]] = self.bot.restricted_api_pings
+        if len(pings) > 1:
+            for name, latency in pings.items():
+                text += f"\nInternal bot API `{name}` pong: " + (
+                    f"**{latency} ms**" if latency is not None else "no response"
+                )
+        elif self.bot.restricted_api_ping:
             text += f"\nInternal bot API pong: **{self.bot.restricted_api_ping} ms**"
         await ctx.reply(text)
 
@@ -118,6 +192,39 @@ class Meta(commands.Cog):
         """Show invite link of the bot."""
         await ctx.reply(f"<{discord.utils.oauth_url(ctx.me.id)}>")
 
+    @botto.group(invoke_without_command=True)
+    async def prefix(self, ctx: botto.Context) -> None:
+        """Show command prefixes of this server."""
+        prefixes: List[str] = self.bot.prefixes.get_prefixes(ctx.guild.id if ctx.guild else None)
+        lines: List[str] = [self.bot.user.mention] + [f"`{prefix}`" for prefix in prefixes]
+        await ctx.reply("My command prefixes here are:\n" + "\n".join(lines))
+
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    @botto.require_database()
+    @prefix.command(name="set")
+    async def prefix_set(self, ctx: botto.Context, *prefixes: str) -> None:
+        """Set custom command prefixes of this server."""
+        if not prefixes:
+            raise commands.BadArgument("At least one prefix is required.")
+        if len(prefixes) > MAX_PREFIXES:
+            raise commands.BadArgument(f"A server can have up to {MAX_PREFIXES} prefixes.")
+        if any(len(prefix) > MAX_PREFIX_LENGTH for prefix in prefixes):
+            raise commands.BadArgument(
+                f"Prefixes can be up to {MAX_PREFIX_LENGTH} characters long."
+            )
+        await self.bot.prefixes.set_prefixes(ctx.guild.id, prefixes)
+        await ctx.reply("Command prefixes of this server have been updated.")
+
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    @botto.require_database()
+    @prefix.command(name="reset")
+    async def prefix_reset(self, ctx: botto.Context) -> None:
+        """Reset command prefixes of this server to the default ones."""
+        await self.bot.prefixes.reset_prefixes(ctx.guild.id)
+        await ctx.reply("Command prefixes of this server have been reset.")
+
     @botto.command(enabled=bool(botto.config["SOURCE_CODE_URL"]))
     async def source(self, ctx: botto.Context) -> None:
         """Show GitHub link to source code."""
@@ -0,0 +1,54 @@
+import logging
+import math
+from typing import Optional
+
+from aiohttp import web
+from discord.ext import commands
+
+import botto
+
+
+logger: logging.Logger = logging.getLogger("botto.metrics")  # pylint: disable=invalid-name
+
+
+class Metrics(commands.Cog):
+    """Local HTTP endpoint exposing metrics in the Prometheus text format."""
+
+    def __init__(self, bot: botto.Botto) -> None:
+        self.bot: botto.Botto = bot
+        self.runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+        if botto.config["METRICS_PORT"] is None:
+            logger.warning("METRICS_PORT is not set in config file, not serving metrics.")
+            return
+        # Each cluster listens on its own port after the configured one
+        self.port = botto.config["METRICS_PORT"] + (self.bot.cluster_id or 0)
+        self.bot.loop.create_task(self.start_server())
+
+    def cog_unload(self) -> None:
+        if self.runner:
+            self.bot.loop.create_task(self.runner.cleanup())
+
+    async def start_server(self) -> None:
+        app: web.Application = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        app.router.add_get("/health", self.handle_health)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site: web.TCPSite = web.TCPSite(self.runner, "127.0.0.1", self.port)
+        await site.start()
+        logger.info("Serving metrics on port %s.", self.port)
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.bot.metrics.render(), content_type="text/plain")
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        # Latency is infinite or NaN for shards without a heartbeat acknowledgement
+        healthy: bool = self.bot.is_ready() and all(
+            math.isfinite(latency) for _, latency in self.bot.latencies
+        )
+        return web.Response(text="ok" if healthy else "unavailable", status=200 if healthy else 503)
+
+
+def setup(bot: botto.Botto) -> None:
+    bot.add_cog(Metrics(bot))
@@ -22,6 +22,9 @@ import botto
 
 actions_logger = logging.getLogger("botto.actions")  # pylint: disable=invalid-name
 
+# Seconds the owner can delete an uploaded gist by reacting with :wastebasket:
+WASTEBASKET_TIMEOUT: float = 24 * 60 * 60
+
 
 class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
     """Developer and owner-only commands."""
@@ -29,6 +32,11 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
     def __init__(self, bot: botto.Botto) -> None:
         self.bot: botto.Botto = bot
         self._last_result: Optional[Any] = None
+        self._wastebasket_listeners: List[botto.InteractionListener] = []
+
+    def cog_unload(self) -> None:
+        for listener in self._wastebasket_listeners:
+            self.bot.interactions.remove_listener(listener)
 
     async def cog_check(  # pylint: disable=invalid-overridden-method
         self, ctx: botto.Context
@@ -51,15 +59,29 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
             origin += f" of '{ctx.guild}'"
         return origin
 
-    @commands.Cog.listener()
-    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
+    async def add_gist_wastebasket(self, message: discord.Message) -> None:
+        """React with :wastebasket: and listen for the owner reacting with it."""
+        await message.add_reaction("\N{WASTEBASKET}")
+        self._wastebasket_listeners = [
+            listener for listener in self._wastebasket_listeners if listener.active
+        ]
+        self._wastebasket_listeners.append(
+            self.bot.interactions.add_reaction_listener(
+                message.id,
+                self.bot.owner_id,
+                self.on_wastebasket_reaction,
+                timeout=WASTEBASKET_TIMEOUT,
+            )
+        )
+
+    async def on_wastebasket_reaction(self, payload: discord.RawReactionActionEvent) -> None:
         """Delete gist in message by reacting with :wastebucket:."""
-        if str(payload.emoji) != "\N{WASTEBASKET}" or payload.user_id != self.bot.owner_id:
+        if str(payload.emoji) != "\N{WASTEBASKET}" or payload.event_type != "REACTION_ADD":
             return
 
-        channel: botto.utils.OptionalChannel = self.bot.get_channel(payload.channel_id)
-        assert isinstance(channel, discord.abc.Messageable)
-        message: discord.Message = await channel.fetch_message(payload.message_id)
+        message: discord.Message = await self.bot.get_or_fetch_message(
+            payload.channel_id, payload.message_id
+        )
 
         if message.author != self.bot.user or not message.embeds:
             return
@@ -98,8 +120,9 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
             return
 
         actions_logger.info("Deleted gist %s in message ID: %s.", gist_id, message.id)
+        self.bot.pastes.forget(f"https://gist.github.com/{gist_id}")
 
-        embed: discord.Embed = message.embeds[0]
+        embed: discord.Embed = message.embeds[0].copy()
         embed.description = "The gist containing the results was deleted."
 
         try:
@@ -134,11 +157,16 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
     @botto.command()
     async def logs(self, ctx: botto.Context) -> None:
         """DM bot logs."""
-        with open("botto.log") as file:
+        with open(botto.logs.get_log_filename(self.bot.cluster_id)) as file:
             content: str = file.read()
-            paste_url: str = await botto.utils.hastebin(content)
-            await ctx.author.send(f"Logs: {paste_url}")
-            await ctx.message.add_reaction("\N{OPEN MAILBOX WITH RAISED FLAG}")
+        paste: Optional[botto.Paste] = await self.bot.pastes.upload(
+            content, files=[("logs.txt", content)]
+        )
+        if paste is None:
+            await ctx.reply("Failed to upload the logs.")
+            return
+        await ctx.author.send(f"Logs: {paste.url}")
+        await ctx.message.add_reaction("\N{OPEN MAILBOX WITH RAISED FLAG}")
 
     @botto.command(aliases=["runas"])
     async def pseudo(self, ctx: botto.Context, user: discord.Member, *, message: str) -> None:
@@ -222,6 +250,89 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
         """Test response when bot is missing fundamental permissions."""
         raise botto.BotMissingFundamentalPermissions(["abstract_authority"])
 
+    # ------ Cache ------
+
+    @botto.command()
+    async def cachestats(self, ctx: botto.Context, resync: bool = False) -> None:
+        """Compare cache statistics counters with a full recount."""
+        counters: Dict[str, int] = self.bot.cache_statistics.totals
+        recount: Dict[str, int] = botto.core.statistics.count_guilds(self.bot.guilds)
+        lines: List[str] = [
+            f"{key}: {counters[key]} counted, {recount[key]} cached"
+            + (
+                f" (drift {counters[key] - recount[key]:+})"
+                if counters[key] != recount[key]
+                else ""
+            )
+            for key in counters
+        ]
+        if resync:
+            self.bot.cache_statistics.resync()
+            lines.append("Counters have been resynced.")
+        await ctx.reply("```\n" + "\n".join(lines) + "\n```")
+
+    @botto.command()
+    async def processstats(self, ctx: botto.Context) -> None:
+        """Show minimum, average and maximum process metrics of the last hour."""
+        summary: Dict[str, Tuple[float, float, float]] = self.bot.sampler.summarize()
+        if not summary:
+            await ctx.reply("No process samples have been taken yet.")
+            return
+        lines: List[str] = [
+            f"{metric:<8} {low:>10.2f} {average:>10.2f} {high:>10.2f}"
+            for metric, (low, average, high) in summary.items()
+        ]
+        header: str = f"{'':<8} {'min':>10} {'avg':>10} {'max':>10}"
+        await ctx.reply(
+            f"Last {len(self.bot.sampler.history)} samples:\n"
+            + "```\n"
+            + "\n".join([header] + lines)
+            + "\n```"
+        )
+
+    @botto.command()
+    async def commandstats(self, ctx: botto.Context, amount: int = 10, key: str = "calls") -> None:
+        """Show the most used or slowest commands.
+
+        Sort by "calls" or "latency".
+        """
+        top: List[Tuple[str, botto.core.metrics.CommandMetrics]] = self.bot.metrics.top(amount, key)
+        if not top:
+            await ctx.reply("No commands have been invoked yet.")
+            return
+        lines: List[str] = [
+            f"{'command':<20} {'calls':>6} {'fails':>6} {'avg ms':>8} {'p95 ms':>8}"
+        ]
+        for name, metrics in top:
+            total = metrics.latencies["total"]
+            lines.append(
+                f"{name[:20]:<20} {metrics.calls:>6} {metrics.failures:>6} "
+                f"{total.average * 1000:>8.1f} {total.quantile(0.95) * 1000:>8.0f}"
+            )
+        errors: List[str] = [
+            f"{count}x {error} in {name or 'unknown command'}"
+            for (name, error), count in self.bot.metrics.errors.most_common(5)
+        ]
+        if errors:
+            lines += ["", "Most common errors:"] + errors
+        await ctx.reply("```\n" + "\n".join(lines) + "\n```")
+
+    @botto.command()
+    async def errorstats(self, ctx: botto.Context, amount: int = 10) -> None:
+        """Show the most frequent unhandled errors by fingerprint."""
+        records: List[botto.ErrorRecord] = self.bot.error_tracker.top(amount)
+        if not records:
+            await ctx.reply("No unhandled errors have occurred yet.")
+            return
+        lines: List[str] = [
+            f"{record.fingerprint} {record.count:>6}x {record.error_type} in "
+            f"'{record.command}', first {record.first_seen:%Y-%m-%d %H:%M}, "
+            f"last {record.last_seen:%Y-%m-%d %H:%M}\n"
+            f"    {botto.utils.limit_str(record.message, 80)}"
+            for record in records
+        ]
+        await ctx.reply("```\n" + botto.utils.limit_str("\n".join(lines), 1900) + "\n```")
+
     # ------ Code ------
 
     @botto.command()
@@ -281,15 +392,21 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
 
         result_string: str = "\n".join(result)
         is_uploaded: bool = False
+        file: Optional[discord.File] = None
 
         if len(result_string) > 2048:
-            url: str = await botto.utils.gist(
-                *to_upload,
+            paste: Optional[botto.Paste] = await self.bot.pastes.upload(
+                result_string[4:-4],
+                files=to_upload,
                 description=(f"Shell command results from {self._get_origin(ctx)} at {timestamp}."),
-                session=self.bot.session,
+                backends=("gist",),
             )
-            result_string = f"Results too long. View them [here]({url})."
-            is_uploaded = True
+            if paste is None:
+                file = discord.File(io.StringIO(result_string[4:-4]), "results.txt")
+                result_string = "Results too long. View them in the file."
+            else:
+                result_string = f"Results too long. View them [here]({paste.url})."
+                is_uploaded = True
 
         embed: discord.Embed = discord.Embed(
             description=result_string,
@@ -299,12 +416,12 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
         embed.set_author(name="Shell Command Results")
         embed.set_footer(text=f"Took {delta:.2f} ms")
 
-        message = await ctx.reply(embed=embed)
+        message = await ctx.reply(embed=embed, file=file)
         if is_uploaded and (
             (ctx.guild and botto.config["INTENTS"]["GUILD_REACTIONS"])
             or (not ctx.guild and botto.config["INTENTS"]["DM_REACTIONS"])
         ):
-            await message.add_reaction("\N{WASTEBASKET}")
+            await self.add_gist_wastebasket(message)
 
     @botto.command(name="eval")
     async def eval_command(self, ctx: botto.Context, *, code: str) -> None:
@@ -402,41 +519,29 @@ class Owner(commands.Cog, command_attrs=dict(hidden=True)):  # type: ignore
         if len(result_string) <= 2048:
             embed.description = result_string
         else:
-            try:
-                url: str = await botto.utils.gist(
-                    *to_upload,
-                    description=(
-                        f"Eval command results from {self._get_origin(ctx)} "
-                        f"at {embed.timestamp}."
-                    ),
-                    session=self.bot.session,
-                )
-            except (aiohttp.ClientResponseError, ValueError):
-                try:
-                    url = await botto.utils.hastebin(
-                        f"Eval command results from {self._get_origin(ctx)} "
-                        f"at {embed.timestamp}.\n\n{result_string[6:-4]}",
-                        session=self.bot.session,
-                    )
-                except (aiohttp.ClientResponseError, ValueError):
-                    # If 8MB is insufficient, give up
-                    file = discord.File(io.StringIO(result_string[6:-4]), "results.txt")
-                    embed.description = "Results too long. View them in the file."
-                else:
-                    uploaded_to = "hastebin"
+            paste: Optional[botto.Paste] = await self.bot.pastes.upload(
+                result_string[6:-4],
+                files=to_upload,
+                description=(
+                    f"Eval command results from {self._get_origin(ctx)} at {embed.timestamp}."
+                ),
+                backends=("gist", "hastebin"),
+            )
+            if paste is None:
+                # If 8MB is insufficient, give up
+                file = discord.File(io.StringIO(result_string[6:-4]), "results.txt")
+                embed.description = "Results too long. View them in the file."
             else:
-                uploaded_to = "github"
-
-        if uploaded_to:
-            embed.description = f"Results too long. View them [here]({url})."
+                uploaded_to = paste.backend
+                embed.description = f"Results too long. View them [here]({paste.url})."
 
         message = await ctx.reply(embed=embed, file=file)
 
-        if uploaded_to == "github" and (
+        if uploaded_to == "gist" and (
             (ctx.guild and botto.config["INTENTS"]["GUILD_REACTIONS"])
             or (not ctx.guild and botto.config["INTENTS"]["DM_REACTIONS"])
         ):
-            await message.add_reaction("\N{WASTEBASKET}")
+            await self.add_gist_wastebasket(message)
 
         return message
 
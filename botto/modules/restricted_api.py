@@ -1,7 +1,24 @@
 import asyncio
+import collections
 import datetime
+import inspect
 import logging
-from typing import Any, Dict, Optional
+import random
+import time
+import uuid
+import zlib
+from typing import (
+    Any,
+    Callable,
+    Counter,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
 
 import aiohttp
 import discord
@@ -14,82 +31,672 @@ try:
 except ImportError:
     import json  # type: ignore
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 
 logger: logging.Logger = logging.getLogger("botto.restricted_api")  # pylint: disable=invalid-name
 
 
-class RestrictedApi(commands.Cog):
-    def __init__(self, bot: botto.Botto) -> None:
-        self.bot: botto.Botto = bot
+# Seconds events are collected before being sent together in one frame
+FLUSH_WINDOW = 0.005
+# Events sent right away once this many are waiting
+MAX_BATCH_SIZE = 50
+# Base and maximum of the exponential delay in seconds between connection attempts
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+# Seconds a connection must stay open before the delay starts over
+STABLE_CONNECTION_TIME = 60.0
+# Seconds after a disconnect during which events are queued instead of refused
+RECONNECT_GRACE = 30.0
+# Events queued while disconnected and seconds each is worth sending after reconnecting
+MAX_QUEUED_EVENTS = 100
+QUEUED_EVENT_TTL = 30.0
+# Weights of the newest ping in a backend's rolling latency and of the newest call
+# outcome in its error rate
+LATENCY_DECAY = 0.3
+ERROR_RATE_DECAY = 0.2
+# Latency assumed for backends not pinged yet
+UNKNOWN_LATENCY = 0.5
+# Times more a backend failing every call costs than one failing none
+ERROR_COST_FACTOR = 10.0
+# Backends failing a larger share of calls are only used if every backend does
+UNHEALTHY_ERROR_RATE = 0.5
+
+
+class JsonCodec:
+    protocol = "botto.json"
+    binary = False
+
+    @staticmethod
+    def encode(data: Any) -> str:
+        return json.dumps(data)
+
+    @staticmethod
+    def decode(raw: Any) -> Any:
+        return json.loads(raw)
+
+
+class MsgpackCodec:
+    protocol = "botto.msgpack"
+    binary = True
+
+    @staticmethod
+    def encode(data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    @staticmethod
+    def decode(raw: Any) -> Any:
+        return msgpack.unpackb(raw, raw=False)
+
+
+# WebSocket subprotocols offered to the backend, most preferred first
+CODECS: Dict[str, Any] = {
+    codec.protocol: codec
+    for codec in (MsgpackCodec, JsonCodec)
+    if codec is not MsgpackCodec or msgpack is not None
+}
+
+FrameHandler = Callable[[Dict[str, Any]], Any]
+
+
+class HandlerEntry(NamedTuple):
+    func: FrameHandler
+    inline: bool
+
+
+class RoutedFrame(NamedTuple):
+    frame: Dict[str, Any]
+    routing_key: Optional[Hashable] = None
+    # Set when first queued and kept when queued again, so bouncing events still expire
+    expires: Optional[float] = None
+
+
+def handler(frame_type: str, *, inline: bool = False) -> Callable[[FrameHandler], FrameHandler]:
+    """Mark a method as the handler of restricted API frames of a type.
+
+    Handlers are called with the frame in a new task, or right in the read loop if
+    inline, which suits cheap handlers of frequent frames. Marked methods are registered
+    with RestrictedApi.register_handlers_of.
+    """
+
+    def decorator(func: FrameHandler) -> FrameHandler:
+        func.__restricted_api_handler__ = (frame_type, inline)  # type: ignore
+        return func
+
+    return decorator
+
+
+class Backend:
+    """Connection to one restricted API server with its health statistics.
+
+    Latency is averaged over pings and the error rate over call outcomes, both weighted
+    exponentially so recent behaviour counts the most.
+    """
+
+    def __init__(self, cog: "RestrictedApi", url: str) -> None:
+        self.cog: "RestrictedApi" = cog
+        self.bot: botto.Botto = cog.bot
+        self.url: str = url
+        self.name: str = url.split("://", 1)[-1].rstrip("/")
         self.websocket: Optional[aiohttp.ClientWebSocketResponse] = None
+        # Starting counts as a disconnect so early events wait for the first connection
+        self.disconnected_at: Optional[float] = time.monotonic()
+        # Latest ping and the rolling average of pings, None until answered
         self.latency: Optional[float] = None
-        self.connect_task_loop: asyncio.Task = self.bot.loop.create_task(self.connect_to_server())
+        self.average_latency: Optional[float] = None
+        self.error_rate: float = 0.0
+        # Nonces of calls routed here waiting for their response
+        self.outstanding: Set[str] = set()
+        # Nonces of calls sent on the current connection, their responses die with it
+        self.sent_nonces: Set[str] = set()
+        # Backends without subprotocols get one JSON text frame per event
+        self.codec: Any = JsonCodec
+        self.batching: bool = False
+        self._outbox: List[RoutedFrame] = []
+        self._flush_future: Optional[asyncio.Future] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Payload sizes before compression, which aiohttp does not expose
+        self.traffic: Counter[str] = collections.Counter()
+        self.connect_task: asyncio.Task = self.bot.loop.create_task(self.connect())
 
-    def stop_and_disconnect(self) -> None:
-        self.connect_task_loop.cancel()
-        self.ping_and_get_latency.cancel()  # pylint: disable=no-member
-        if self.websocket:
-            self.bot.loop.create_task(self.websocket.close())
-            logger.info("Disconnected from restricted API.")
+    @property
+    def is_connected(self) -> bool:
+        return self.websocket is not None and not self.websocket.closed
 
-    def cog_unload(self) -> None:
-        self.stop_and_disconnect()
+    @property
+    def is_available(self) -> bool:
+        """Whether events can be sent, now or once reconnected within the grace period."""
+        # A closed socket not yet noticed by the read loop is about to be reconnected
+        return self.websocket is not None or (
+            self.disconnected_at is not None
+            and time.monotonic() - self.disconnected_at < RECONNECT_GRACE
+        )
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.error_rate <= UNHEALTHY_ERROR_RATE
 
-    async def connect_to_server(self) -> None:
+    @property
+    def cost(self) -> float:
+        """Expected wait of one more call relative to other backends, lower is better."""
+        latency: float = UNKNOWN_LATENCY if self.average_latency is None else self.average_latency
+        return (len(self.outstanding) + 1) * latency * (1 + self.error_rate * ERROR_COST_FACTOR)
+
+    def record_latency(self, latency: Optional[float]) -> None:
+        self.latency = latency
+        if latency is None:
+            return
+        if self.average_latency is None:
+            self.average_latency = latency
+        else:
+            self.average_latency += LATENCY_DECAY * (latency - self.average_latency)
+
+    def record_outcome(self, failed: bool) -> None:
+        self.error_rate += ERROR_RATE_DECAY * (failed - self.error_rate)
+
+    def stop(self) -> None:
+        self.connect_task.cancel()
+        self.connection_lost()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        if self._flush_future is not None and not self._flush_future.done():
+            self._flush_future.set_exception(botto.NotConnectedToRestrictedApi())
+            self._flush_future.exception()
+        self.disconnected_at = None
+
+    def connection_lost(self) -> None:
+        """Forget the current connection, failing calls whose request was sent on it."""
+        websocket, self.websocket = self.websocket, None
+        if websocket is None:
+            return
+        self.disconnected_at = time.monotonic()
+        self.latency = None
+        if not websocket.closed:
+            self.bot.loop.create_task(websocket.close())
+        self.cog.fail_pending_calls(self.sent_nonces)
+        self.sent_nonces.clear()
+        logger.info("Disconnected from restricted API at %s.", self.name)
+
+    async def connect(self) -> None:
+        attempt: int = 0
         while not self.bot.is_closed():
-            self.ping_and_get_latency.cancel()  # pylint: disable=no-member
+            if attempt:
+                # Full jitter keeps clusters from reconnecting in lockstep after an outage
+                delay: float = random.uniform(
+                    0, min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** (attempt - 1))
+                )
+                logger.info("Connecting to restricted API at %s in %.1f seconds.", self.name, delay)
+                await asyncio.sleep(delay)
             try:
-                self.websocket = await self.bot.session.ws_connect(
-                    botto.config["RESTRICTED_API_URL"]
+                websocket: aiohttp.ClientWebSocketResponse = await self.bot.session.ws_connect(
+                    self.url, protocols=tuple(CODECS), compress=15
                 )
-            except aiohttp.ClientConnectorError:
-                logger.exception(
-                    "Exception raised in restricted API connection. Retrying in 5 seconds."
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as exc:
+                attempt += 1
+                logger.warning(
+                    "Failed to connect to restricted API at %s. (%s: %s)",
+                    self.name,
+                    type(exc).__name__,
+                    exc,
                 )
-                await asyncio.sleep(5)
                 continue
 
-            logger.info("Connected to restricted API.")
-            self.ping_and_get_latency.start()  # pylint: disable=no-member
-            async for msg in self.websocket:
-                data: Dict[str, Any] = json.loads(msg.data)
-                self.bot.dispatch("restricted_api_" + data["type"], data)
-            logger.info("Disconnected from restricted API.")
+            connected_at: float = time.monotonic()
+            # Every connection negotiates its own codec
+            self.codec = CODECS.get(websocket.protocol or "", JsonCodec)
+            self.batching = websocket.protocol is not None
+            self.websocket = websocket
+            self.disconnected_at = None
+            logger.info(
+                "Connected to restricted API at %s with %s framing.",
+                self.name,
+                self.codec.protocol,
+            )
+            self.cog.backend_connected(self)
+            try:
+                await self.read(websocket)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Lost connection to restricted API at %s.", self.name)
+            finally:
+                # Also when reading failed, so the connection is not picked any longer
+                if self.websocket is websocket:
+                    self.connection_lost()
+            # Connections closed soon after the handshake, for example when the backend
+            # rejects the bot or is overloaded, keep backing off
+            if time.monotonic() - connected_at < STABLE_CONNECTION_TIME:
+                attempt += 1
+            else:
+                attempt = 1
+
+    async def read(self, websocket: aiohttp.ClientWebSocketResponse) -> None:
+        async for msg in websocket:
+            if msg.type not in (aiohttp.WSMsgType.BINARY, aiohttp.WSMsgType.TEXT):
+                continue
+            self.traffic["frames_received"] += 1
+            # Text frames of the backend may contain any UTF-8, not only escaped ASCII
+            self.traffic["bytes_received"] += (
+                len(msg.data) if msg.type == aiohttp.WSMsgType.BINARY else len(msg.data.encode())
+            )
+            data: Any
+            try:
+                if msg.type == aiohttp.WSMsgType.BINARY:
+                    data = self.codec.decode(msg.data)
+                else:
+                    data = json.loads(msg.data)
+            except Exception:  # pylint: disable=broad-except
+                # One malformed frame must not end the connection
+                self.traffic["frames_invalid"] += 1
+                logger.exception("Failed to decode restricted API frame from %s.", self.name)
+                continue
+            # The backend may push a batch of frames as one array
+            for frame in data if isinstance(data, list) else (data,):
+                try:
+                    await self.cog.handle_frame(frame)
+                except Exception:  # pylint: disable=broad-except
+                    self.traffic["frames_invalid"] += 1
+                    logger.exception("Failed to handle restricted API frame from %s.", self.name)
+
+    # ------ Sending ------
+
+    async def send(self, entry: RoutedFrame) -> None:
+        """Send a routed event, collected with others into one frame if negotiated."""
+        if not self.batching:
+            await self.send_or_requeue([entry])
+            return
+
+        self._outbox.append(entry)
+        if self._flush_future is None:
+            self._flush_future = self.bot.loop.create_future()
+            self._flush_handle = self.bot.loop.call_later(FLUSH_WINDOW, self.flush)
+        future: asyncio.Future = self._flush_future
+        if len(self._outbox) >= MAX_BATCH_SIZE:
+            self.flush()
+        # Other events of the batch still need the result if this caller is cancelled
+        await asyncio.shield(future)
+
+    def flush(self) -> None:
+        """Send the collected events in one frame."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        entries, self._outbox = self._outbox, []
+        future, self._flush_future, self._flush_handle = self._flush_future, None, None
+        if future is not None:
+            self.bot.loop.create_task(self._flush(entries, future))
+
+    async def _flush(self, entries: List[RoutedFrame], future: asyncio.Future) -> None:
+        try:
+            await self.send_or_requeue(entries)
+        except Exception as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+            # Mark the exception retrieved in case every sender was cancelled
+            future.exception()
+        else:
+            future.set_result(None)
+
+    async def send_or_requeue(self, entries: List[RoutedFrame]) -> None:
+        try:
+            await self.send_frames([entry.frame for entry in entries])
+        except botto.NotConnectedToRestrictedApi:
+            # Routed again to another backend, or kept until one connects
+            self.cog.requeue(self, entries)
+
+    async def send_frames(self, frames: List[Dict[str, Any]]) -> None:
+        """Send frames as one, raise NotConnectedToRestrictedApi if the connection is lost."""
+        websocket: Optional[aiohttp.ClientWebSocketResponse] = self.websocket
+        if websocket is None or websocket.closed:
+            raise botto.NotConnectedToRestrictedApi
+        # Single events stay plain objects so they are the same as unbatched frames
+        payload: Any = self.codec.encode(frames[0] if len(frames) == 1 else frames)
+        try:
+            if self.codec.binary:
+                await websocket.send_bytes(payload)
+            else:
+                await websocket.send_str(payload)
+        except (RuntimeError, ConnectionResetError) as exc:
+            # The transport closed before the read loop noticed
+            if self.websocket is websocket:
+                self.connection_lost()
+            raise botto.NotConnectedToRestrictedApi from exc
+        self.sent_nonces.update(frame["nonce"] for frame in frames if "nonce" in frame)
+        self.traffic["frames_sent"] += 1
+        self.traffic["events_sent"] += len(frames)
+        # Both JSON libraries escape non-ASCII characters, so characters are bytes here
+        self.traffic["bytes_sent"] += len(payload)
+
+
+class RestrictedApi(commands.Cog):
+    """Connections to the restricted API servers listed in RESTRICTED_API_URL.
+
+    Events are routed to the connected backend with the lowest cost, which grows with
+    its outstanding calls, rolling latency and error rate. Events with a routing key,
+    such as a guild ID, always go to the same backend while it is connected, chosen by
+    rendezvous hashing so only keys of a lost backend move. Backends failing most calls
+    are avoided until their pings succeed again.
+    """
 
+    def __init__(self, bot: botto.Botto) -> None:
+        self.bot: botto.Botto = bot
+        # Events waiting for a connection
+        self._queue: Deque[RoutedFrame] = collections.deque()
+        self.expired_events: int = 0
+        # Futures of calls waiting for their response by nonce
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.call_latencies: Dict[str, botto.core.metrics.Histogram] = {}
+        self.handlers: Dict[str, HandlerEntry] = {}
+        self.frame_counts: Counter[str] = collections.Counter()
+        self.unknown_frame_counts: Counter[str] = collections.Counter()
+        self.register_handlers_of(self)
+        urls: Any = botto.config["RESTRICTED_API_URL"]
+        # A single URL is still accepted
+        if isinstance(urls, str):
+            urls = [urls]
+        self.backends: List[Backend] = [Backend(self, url) for url in urls or ()]
+        self.ping_and_get_latency.start()  # pylint: disable=no-member
+
+    @property
+    def is_connected(self) -> bool:
+        return any(backend.is_connected for backend in self.backends)
+
+    @property
+    def is_available(self) -> bool:
+        """Whether events can be sent, now or once reconnected within the grace period."""
+        return any(backend.is_available for backend in self.backends)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Average of the latest pings of connected backends."""
+        latencies: List[float] = [
+            backend.latency for backend in self.backends if backend.latency is not None
+        ]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def stop_and_disconnect(self) -> None:
         self.ping_and_get_latency.cancel()  # pylint: disable=no-member
+        self._queue.clear()
+        for backend in self.backends:
+            backend.stop()
+        # Nothing is sent anymore so every call fails now
+        self.fail_pending_calls()
+
+    def cog_unload(self) -> None:
+        self.stop_and_disconnect()
+
+    def backend_connected(self, backend: Backend) -> None:
+        self.bot.loop.create_task(self.ping(backend))
+        self.bot.loop.create_task(self.send_queued_events())
+
+    # ------ Routing ------
+
+    def pick_backend(self, routing_key: Optional[Hashable] = None) -> Optional[Backend]:
+        """Return the connected backend an event is sent to, None if there is none."""
+        connected: List[Backend] = [backend for backend in self.backends if backend.is_connected]
+        candidates: List[Backend] = [
+            backend for backend in connected if backend.is_healthy
+        ] or connected
+        if not candidates:
+            return None
+        if routing_key is not None:
+            # The hash must not depend on the process, other clusters route the same way
+            return max(
+                candidates,
+                key=lambda backend: zlib.crc32(f"{routing_key}:{backend.url}".encode("utf-8")),
+            )
+        # Ties are broken randomly so idle backends share fire-and-forget events
+        return min(candidates, key=lambda backend: (backend.cost, random.random()))
+
+    async def route_frame(self, entry: RoutedFrame, backend: Optional[Backend] = None) -> None:
+        pinned: bool = backend is not None
+        if backend is None:
+            backend = self.pick_backend(entry.routing_key)
+            if backend is None:
+                self.queue_event(entry)
+                return
+        if "nonce" in entry.frame:
+            backend.outstanding.add(entry.frame["nonce"])
+        if pinned:
+            # Frames about one backend, such as pings, are never sent to another
+            await backend.send_frames([entry.frame])
+        else:
+            await backend.send(entry)
+
+    # ------ Outbound queue ------
+
+    def is_expired(self, entry: RoutedFrame, now: float) -> bool:
+        """Whether a queued event is too old, or is a call whose caller stopped waiting."""
+        if entry.expires is not None and entry.expires < now:
+            return True
+        nonce: Optional[str] = entry.frame.get("nonce")
+        # Sending it would only make the backend act on a request reported as failed
+        return nonce is not None and nonce not in self._pending
+
+    def queue_event(self, entry: RoutedFrame) -> None:
+        """Keep an event until reconnected, unless disconnected for too long or full."""
+        if not self.is_available or len(self._queue) >= MAX_QUEUED_EVENTS:
+            raise botto.NotConnectedToRestrictedApi
+        if entry.expires is None:
+            entry = entry._replace(expires=time.monotonic() + QUEUED_EVENT_TTL)
+        self._queue.append(entry)
+
+    def requeue(self, backend: Backend, entries: List[RoutedFrame]) -> None:
+        """Queue events a backend failed to send, sending them to another one if connected."""
+        now: float = time.monotonic()
+        for entry in entries:
+            backend.outstanding.discard(entry.frame.get("nonce"))
+            if self.is_expired(entry, now):
+                self.expired_events += 1
+            else:
+                self.queue_event(entry)
+        if self.is_connected:
+            self.bot.loop.create_task(self.send_queued_events())
+
+    async def send_queued_events(self) -> None:
+        now: float = time.monotonic()
+        entries: List[RoutedFrame] = []
+        while self._queue:
+            entry: RoutedFrame = self._queue.popleft()
+            if self.is_expired(entry, now):
+                self.expired_events += 1
+            else:
+                entries.append(entry)
+        if not entries:
+            return
+        logger.info("Sending %s queued restricted API events.", len(entries))
+        # Routed together so they are batched like events sent at the same time
+        results: List[Any] = await asyncio.gather(
+            *(self.route_frame(entry) for entry in entries), return_exceptions=True
+        )
+        failed: int = sum(isinstance(result, Exception) for result in results)
+        if failed:
+            logger.warning("Dropped %s queued restricted API events.", failed)
+
+    # ------ Frame handlers ------
+
+    def register_handler(
+        self, frame_type: str, func: FrameHandler, *, inline: bool = False
+    ) -> None:
+        self.handlers[frame_type] = HandlerEntry(func, inline)
+
+    def remove_handler(self, frame_type: str) -> None:
+        self.handlers.pop(frame_type, None)
+
+    def register_handlers_of(self, obj: Any) -> None:
+        """Register every method of an object marked with the handler decorator."""
+        for _, method in inspect.getmembers(obj, inspect.ismethod):
+            marker = getattr(method, "__restricted_api_handler__", None)
+            if marker is not None:
+                frame_type, inline = marker
+                self.register_handler(frame_type, method, inline=inline)
+
+    async def handle_frame(self, frame: Dict[str, Any]) -> None:
+        nonce: Any = frame.get("nonce")
+        future: Optional[asyncio.Future] = (
+            self._pending.get(nonce) if isinstance(nonce, str) else None
+        )
+        if future is not None:
+            # Responses only concern their caller
+            if not future.done():
+                future.set_result(frame)
+            return
+        frame_type: str = frame.get("type", "")
+        entry: Optional[HandlerEntry] = self.handlers.get(frame_type)
+        if entry is None:
+            self.unknown_frame_counts[frame_type] += 1
+            return
+        self.frame_counts[frame_type] += 1
+        if entry.inline:
+            await self.run_handler(entry.func, frame_type, frame)
+        else:
+            self.bot.loop.create_task(self.run_handler(entry.func, frame_type, frame))
+
+    async def run_handler(self, func: FrameHandler, frame_type: str, frame: Dict[str, Any]) -> None:
+        try:
+            result: Any = func(frame)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exc:  # pylint: disable=broad-except
+            if "ctx" in frame:
+                # Reported like an error of the command which sent the request
+                self.bot.dispatch("restricted_api_event_handler_error", frame_type, frame, exc)
+            else:
+                logger.exception("Unhandled exception in '%s' restricted API handler.", frame_type)
+
+    # ------ Calls ------
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls waiting for their response."""
+        return len(self._pending)
+
+    def call_finished(self, nonce: str, failed: Optional[bool]) -> None:
+        """Forget a call, counting its outcome for the backend it was routed to if known."""
+        for backend in self.backends:
+            backend.sent_nonces.discard(nonce)
+            if nonce in backend.outstanding:
+                backend.outstanding.discard(nonce)
+                if failed is not None:
+                    backend.record_outcome(failed)
+
+    def fail_pending_calls(self, nonces: Optional[Set[str]] = None) -> None:
+        """Fail calls waiting for a response, only those of nonces if given."""
+        for nonce in self._pending if nonces is None else nonces:
+            future: Optional[asyncio.Future] = self._pending.get(nonce)
+            if future is not None and not future.done():
+                future.set_exception(botto.NotConnectedToRestrictedApi())
+                # Callers cancelled at the same time never retrieve it
+                future.exception()
+
+    async def call(
+        self,
+        event: str,
+        *,
+        timeout: float = 10.0,
+        routing_key: Optional[Hashable] = None,
+        backend: Optional[Backend] = None,
+        **data: Any,
+    ) -> Dict[str, Any]:
+        """Send an event and return the response carrying the same nonce.
+
+        Raises asyncio.TimeoutError if there is no response within timeout seconds and
+        NotConnectedToRestrictedApi if the connection is lost before it.
+        """
+        nonce: str = uuid.uuid4().hex
+        future: asyncio.Future = self.bot.loop.create_future()
+        self._pending[nonce] = future
+        start: float = time.perf_counter()
+        # Cancelled calls say nothing about the backend
+        failed: Optional[bool] = None
+        try:
+            await self.send_event(
+                event, routing_key=routing_key, backend=backend, nonce=nonce, **data
+            )
+            response: Dict[str, Any] = await asyncio.wait_for(future, timeout=timeout)
+            failed = False
+        except (asyncio.TimeoutError, botto.NotConnectedToRestrictedApi):
+            failed = True
+            raise
+        finally:
+            del self._pending[nonce]
+            self.call_finished(nonce, failed)
+        histogram = self.call_latencies.get(event)
+        if histogram is None:
+            histogram = self.call_latencies[event] = botto.core.metrics.Histogram()
+        histogram.observe(time.perf_counter() - start)
+        return response
+
+    async def call_with_context(
+        self,
+        event: str,
+        ctx: botto.Context,
+        *,
+        timeout: float = 10.0,
+        routing_key: Optional[Hashable] = None,
+        **data: Any,
+    ) -> Dict[str, Any]:
+        return await self.call(
+            event,
+            timeout=timeout,
+            routing_key=routing_key,
+            ctx=self.get_context_data(ctx),
+            **data,
+        )
 
     @tasks.loop(minutes=1)
-    async def ping_and_get_latency(self) -> float:
-        time_start: float = datetime.datetime.utcnow().timestamp()
-        await self.send_event("ping", timestamp=str(time_start))
-        await self.bot.wait_for(
-            "restricted_api_pong",
-            check=lambda payload: payload["timestamp"] == str(time_start),
-            timeout=30,
+    async def ping_and_get_latency(self) -> Optional[float]:
+        await asyncio.gather(
+            *(self.ping(backend) for backend in self.backends if backend.is_connected)
         )
-        time_delta: float = datetime.datetime.utcnow().timestamp() - time_start
-        self.latency = time_delta
+        return self.latency
+
+    async def ping(self, backend: Backend) -> Optional[float]:
+        start: float = time.perf_counter()
+        try:
+            await self.call(
+                "ping",
+                timeout=30,
+                backend=backend,
+                timestamp=str(datetime.datetime.utcnow().timestamp()),
+            )
+        except (asyncio.TimeoutError, botto.NotConnectedToRestrictedApi):
+            backend.record_latency(None)
+            return None
+        time_delta: float = time.perf_counter() - start
+        backend.record_latency(time_delta)
         return time_delta
 
-    @ping_and_get_latency.after_loop
-    async def on_ping_and_get_latency_cancel(self) -> None:
-        if self.ping_and_get_latency.is_being_cancelled():  # pylint: disable=no-member
-            self.latency = None
+    async def send_event(
+        self,
+        event: str,
+        *,
+        routing_key: Optional[Hashable] = None,
+        backend: Optional[Backend] = None,
+        **data: Any,
+    ) -> None:
+        """Send an event to backend, or the one routing_key or load balancing picks.
 
-    async def send_event(self, event: str, **data: Any) -> None:
-        if not self.websocket:
-            raise botto.NotConnectedToRestrictedApi
-        try:
-            await self.websocket.send_str(json.dumps(dict(type=event, **data)))
-        except RuntimeError as exc:
-            # RuntimeError: unable to perform operation on <TCPTransport closed=True reading=False
-            # 0x??? >; the handler is closed
-            self.stop_and_disconnect()
-            RestrictedApi.__init__(self, self.bot)
-            raise botto.NotConnectedToRestrictedApi from exc
+        Events are queued if no backend is connected. Raises NotConnectedToRestrictedApi
+        if every backend is disconnected for longer than RECONNECT_GRACE or the queue is
+        full, or if the given backend is disconnected.
+        """
+        await self.route_frame(RoutedFrame(dict(type=event, **data), routing_key), backend)
 
-    async def send_event_with_context(self, event: str, ctx: botto.Context, **data: Any) -> None:
-        context: Dict[str, Any] = {
+    async def send_event_with_context(
+        self,
+        event: str,
+        ctx: botto.Context,
+        *,
+        routing_key: Optional[Hashable] = None,
+        **data: Any,
+    ) -> None:
+        await self.send_event(
+            event, routing_key=routing_key, ctx=self.get_context_data(ctx), **data
+        )
+
+    @staticmethod
+    def get_context_data(ctx: botto.Context) -> Dict[str, Any]:
+        return {
             "author": {
                 "name": ctx.author.name,
                 "discriminator": ctx.author.discriminator,
@@ -102,7 +709,6 @@ class RestrictedApi(commands.Cog):
             "guild": ({"name": ctx.guild.name, "id": ctx.guild.id} if ctx.guild else None),
             "message": {"id": ctx.message.id},
         }
-        await self.send_event(event, ctx=context, **data)
 
     def get_statistics_embed(self, payload: Dict[str, Any]) -> discord.Embed:
         embed: discord.Embed = discord.Embed(
@@ -110,7 +716,7 @@ class RestrictedApi(commands.Cog):
         )
         embed.set_thumbnail(url=self.bot.user.avatar_url)
 
-        embed.add_field(name="Connection", value=f"{self.bot.restricted_api_ping} ms latest")
+        embed.add_field(name="Connection", value=self.get_connection_summary())
         embed.add_field(
             name="Process",
             value=(
@@ -129,23 +735,35 @@ class RestrictedApi(commands.Cog):
 
         return embed
 
+    def get_connection_summary(self) -> str:
+        if len(self.backends) == 1:
+            return f"{self.bot.restricted_api_ping} ms latest"
+        lines: List[str] = []
+        for backend in self.backends:
+            if not backend.is_connected:
+                lines.append(f"`{backend.name}` disconnected")
+                continue
+            if backend.latency is None:
+                lines.append(f"`{backend.name}` not pinged yet")
+                continue
+            lines.append(
+                f"`{backend.name}` {round(backend.latency * 1000)} ms, "
+                f"{round((backend.average_latency or 0) * 1000)} ms average, "
+                f"{backend.error_rate:.0%} errors"
+            )
+        return "\n".join(lines)
+
     @botto.require_restricted_api()
     @botto.command()
     async def webstats(self, ctx: botto.Context) -> None:
         """Show general statistics of the backend server and system."""
 
-        await self.bot.send_api_event_with_context("stats", ctx)
-
-    @commands.Cog.listener()
-    async def on_restricted_api_ack_stats(self, payload: dict) -> None:
-        channel: botto.utils.OptionalChannel = self.bot.get_channel(payload["ctx"]["channel"]["id"])
-        if not channel:
+        try:
+            payload: Dict[str, Any] = await self.call_with_context("stats", ctx)
+        except asyncio.TimeoutError:
+            await ctx.reply("The backend server did not respond in time. Please try again later.")
             return
-        message: discord.PartialMessage = channel.get_partial_message(
-            payload["ctx"]["message"]["id"]
-        )
-        embed: discord.Embed = self.get_statistics_embed(payload)
-        await message.reply(embed=embed)
+        await ctx.reply(embed=self.get_statistics_embed(payload))
 
 
 def setup(bot: botto.Botto) -> None:
@@ -0,0 +1,23 @@
+-- :macro create_table()
+CREATE TABLE IF NOT EXISTS guild_prefixes (
+    guild_id BIGINT PRIMARY KEY,
+    prefixes TEXT[] NOT NULL
+);
+-- :endmacro
+
+-- :macro get_all_prefixes()
+SELECT guild_id, prefixes
+FROM guild_prefixes;
+-- :endmacro
+
+-- :macro set_prefixes()
+INSERT INTO guild_prefixes (guild_id, prefixes)
+VALUES ($1, $2)
+ON CONFLICT (guild_id)
+DO UPDATE SET prefixes = EXCLUDED.prefixes;
+-- :endmacro
+
+-- :macro delete_prefixes()
+DELETE FROM guild_prefixes
+WHERE guild_id = $1;
+-- :endmacro
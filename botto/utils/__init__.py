@@ -8,7 +8,27 @@ import aiohttp
 import discord
 
 from botto import config  # pylint: disable=cyclic-import
-from .paginator import EmbedPaginator
+from .concurrency import coalesce
+from .layout import (
+    AUTHOR_NAME_LIMIT,
+    DESCRIPTION_LIMIT,
+    EMBED_TOTAL_LIMIT,
+    FIELD_COUNT_LIMIT,
+    FIELD_NAME_LIMIT,
+    FIELD_VALUE_LIMIT,
+    EmbedPacker,
+    fields_length,
+    numbered_fields,
+    pack_lines,
+)
+from .paginator import (
+    AsyncIteratorPageSource,
+    EmbedPaginator,
+    ListPageSource,
+    PageSource,
+    PaginatorRegistry,
+    QueryPageSource,
+)
 
 AnyChannel = Union[
     discord.TextChannel,
@@ -75,7 +95,11 @@ async def hastebin(
     """Create a Hastebin-like paste and return the URL."""
     if not create_url or not paste_url:
         raise ValueError("No Hastebin-like URL provided.")
-    session = session or aiohttp.ClientSession()
+    if session is None:
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
+            return await hastebin(
+                content, create_url=create_url, paste_url=paste_url, session=session
+            )
     async with session.post(create_url, data=content.encode("utf-8")) as resp:
         response = await resp.json()
         return paste_url.format(key=response["key"])
@@ -100,7 +124,11 @@ async def gist(
     if description is not None:
         data.update(description=description)
 
-    session = session or aiohttp.ClientSession()
+    if session is None:
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
+            async with session.post(url, headers=headers, json=data) as resp:
+                response = await resp.json()
+                return response["html_url"]
     async with session.post(url, headers=headers, json=data) as resp:
         response = await resp.json()
         return response["html_url"]
@@ -118,7 +146,18 @@ async def try_hastebin_then_gist(
     session: Optional[aiohttp.ClientSession] = None,
 ) -> Optional[str]:
     """Try to create and return Hastebin paste, GitHub gist if it fails, otherwise return None."""
-    session = session or aiohttp.ClientSession()
+    if session is None:
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
+            return await try_hastebin_then_gist(
+                content,
+                create_url=create_url,
+                paste_url=paste_url,
+                filename=filename,
+                description=description,
+                public=public,
+                github_token=github_token,
+                session=session,
+            )
     try:
         return await hastebin(content, create_url=create_url, paste_url=paste_url, session=session)
     except ValueError:
@@ -146,7 +185,18 @@ async def try_gist_then_hastebin(
     session: Optional[aiohttp.ClientSession] = None,
 ) -> Optional[str]:
     """Try to create and return GitHub gist, Hastebin paste if it fails, otherwise return None."""
-    session = session or aiohttp.ClientSession()
+    if session is None:
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
+            return await try_gist_then_hastebin(
+                content,
+                create_url=create_url,
+                paste_url=paste_url,
+                filename=filename,
+                description=description,
+                public=public,
+                github_token=github_token,
+                session=session,
+            )
     try:
         return await gist(
             (filename, content),
@@ -0,0 +1,38 @@
+"""Sharing of one running operation between concurrent callers."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)  # pylint: disable=invalid-name
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+
+async def coalesce(
+    pending: "Dict[K, asyncio.Future[T]]", key: K, func: Callable[[], Awaitable[T]]
+) -> T:
+    """Await func, or the call of it already running for key, and return its result.
+
+    pending holds the futures of running calls by key and is shared by all callers.
+    If the first caller is cancelled, the others get CancelledError as well.
+    """
+    running: Optional["asyncio.Future[T]"] = pending.get(key)
+    if running is not None:
+        return await asyncio.shield(running)
+
+    future: "asyncio.Future[T]" = asyncio.get_event_loop().create_future()
+    pending[key] = future
+    try:
+        result: T = await func()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Mark the exception retrieved in case no other caller is waiting for it
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        del pending[key]
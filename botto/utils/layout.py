@@ -0,0 +1,106 @@
+"""Packing of text into embed fields and embeds within Discord's length limits."""
+
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import discord
+
+AUTHOR_NAME_LIMIT = 256
+DESCRIPTION_LIMIT = 2048
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FIELD_COUNT_LIMIT = 25
+EMBED_TOTAL_LIMIT = 6000
+
+
+def pack_lines(lines: Iterable[str], limit: int = FIELD_VALUE_LIMIT) -> List[Tuple[int, int, str]]:
+    """Join lines into as few chunks as possible, each at most limit characters long.
+
+    Return a list of (first line number, last line number, chunk), numbers are 1-index
+    based and inclusive. Lines longer than limit are cut with an ellipsis.
+    """
+    chunks: List[Tuple[int, int, str]] = []
+    current: List[str] = []
+    length: int = 0
+    first: int = 1
+    number: int = 0
+    for number, line in enumerate(lines, 1):
+        if len(line) > limit:
+            line = line[: limit - 3] + "..."
+        # Joining adds a newline before every line but the first
+        added: int = len(line) + bool(current)
+        if current and length + added > limit:
+            chunks.append((first, number - 1, "\n".join(current)))
+            current, length, first = [], 0, number
+            added = len(line)
+        current.append(line)
+        length += added
+    if current:
+        chunks.append((first, number, "\n".join(current)))
+    return chunks
+
+
+def numbered_fields(
+    name: str, lines: Iterable[str], limit: int = FIELD_VALUE_LIMIT
+) -> List[Tuple[str, str]]:
+    """Return (name, value) fields of lines, named like "name (1-10/25)" if split."""
+    chunks: List[Tuple[int, int, str]] = pack_lines(lines, limit)
+    if len(chunks) <= 1:
+        return [(name, value) for _, _, value in chunks]
+    total: int = chunks[-1][1]
+    return [(f"{name} ({first}-{last}/{total})", value) for first, last, value in chunks]
+
+
+def fields_length(fields: Iterable[Tuple[str, str]]) -> int:
+    return sum(len(name) + len(value) for name, value in fields)
+
+
+class EmbedPacker:
+    """Add fields to embeds, starting a new embed when the current one is full.
+
+    Lengths are tracked as fields are added, so every embed and field is only measured
+    once no matter how many fields are packed.
+
+    Parameters
+    ------------
+    factory: Callable[[], discord.Embed]
+        Create a new embed, its own content counts towards its length.
+    embed: Optional[discord.Embed]
+        An existing embed to add fields to first.
+    """
+
+    def __init__(
+        self, factory: Callable[[], discord.Embed], embed: Optional[discord.Embed] = None
+    ) -> None:
+        self.factory: Callable[[], discord.Embed] = factory
+        self.embeds: List[discord.Embed] = []
+        self._length: int = 0
+        if embed is not None:
+            self._start(embed)
+
+    def _start(self, embed: discord.Embed) -> None:
+        self.embeds.append(embed)
+        self._length = len(embed)
+
+    def fits(self, length: int, count: int = 1) -> bool:
+        """Check if fields of a total length and count fit into the current embed."""
+        return (
+            bool(self.embeds)
+            and self._length + length <= EMBED_TOTAL_LIMIT
+            and len(self.embeds[-1].fields) + count <= FIELD_COUNT_LIMIT
+        )
+
+    def new_embed(self) -> discord.Embed:
+        self._start(self.factory())
+        return self.embeds[-1]
+
+    def add_field(self, name: str, value: str, *, inline: bool = False) -> None:
+        name = name[:FIELD_NAME_LIMIT]
+        value = value[:FIELD_VALUE_LIMIT]
+        if not self.fits(len(name) + len(value)):
+            self.new_embed()
+        self.embeds[-1].add_field(name=name, value=value, inline=inline)
+        self._length += len(name) + len(value)
+
+    def add_fields(self, fields: Iterable[Tuple[str, str]], *, inline: bool = False) -> None:
+        for name, value in fields:
+            self.add_field(name, value, inline=inline)
@@ -7,6 +7,7 @@ GitHub source: https://github.com/Rapptz/RoboDanny/blob/rewrite/cogs/utils/pagin
 """
 
 import asyncio
+import collections
 
 import discord
 
@@ -20,6 +21,184 @@ GOTO_PAGE = "\N{INPUT SYMBOL FOR NUMBERS}"
 STOP_PAGINATION = "\N{BLACK SQUARE FOR STOP}"
 GOTO_HELP = "\N{WHITE QUESTION MARK ORNAMENT}"
 
+# Number of rendered pages kept by a paginator
+PAGE_CACHE_SIZE = 8
+# Interactive sessions open at once, the least recently used ones are closed first
+MAX_SESSIONS = 200
+MAX_SESSIONS_PER_USER = 3
+
+
+class PaginatorRegistry:
+    """Interactive paginator sessions, ordered from least to most recently used.
+
+    Opening a session past the global or per-user limit closes the least recently used
+    session, which stops its loop and clears its reactions.
+    """
+
+    def __init__(self, max_sessions=MAX_SESSIONS, max_sessions_per_user=MAX_SESSIONS_PER_USER):
+        self.max_sessions = max_sessions
+        self.max_sessions_per_user = max_sessions_per_user
+        self.sessions = collections.OrderedDict()
+        self.user_counts = collections.Counter()
+
+    def __len__(self):
+        return len(self.sessions)
+
+    @property
+    def retained_entries(self):
+        """Number of entries held by the sources of open sessions."""
+        return sum(paginator.source.retained_entries for paginator in self.sessions)
+
+    def add(self, paginator):
+        user_id = paginator.author.id
+        if self.user_counts[user_id] >= self.max_sessions_per_user:
+            self.evict(next(p for p in self.sessions if p.author.id == user_id))
+        if len(self.sessions) >= self.max_sessions:
+            self.evict(next(iter(self.sessions)))
+        self.sessions[paginator] = None
+        self.user_counts[user_id] += 1
+
+    def touch(self, paginator):
+        if paginator in self.sessions:
+            self.sessions.move_to_end(paginator)
+
+    def remove(self, paginator):
+        if paginator not in self.sessions:
+            return
+        del self.sessions[paginator]
+        self.user_counts[paginator.author.id] -= 1
+        if not self.user_counts[paginator.author.id]:
+            del self.user_counts[paginator.author.id]
+
+    def evict(self, paginator):
+        self.remove(paginator)
+        paginator.close()
+
+
+class PageSource:
+    """Base class of sources that fetch the entries of a paginator one page at a time.
+
+    Pages are 1-index based. total_entries is None while the total is unknown, and
+    pages before first_available_page can no longer be fetched.
+    """
+
+    def __init__(self, per_page):
+        self.per_page = per_page
+        self.total_entries = None
+        self.first_available_page = 1
+
+    @property
+    def retained_entries(self):
+        """Number of entries held in memory."""
+        return 0
+
+    async def prepare(self):
+        """Called once before the first page is fetched."""
+
+    async def get_page(self, page):
+        """Return the entries of a page, an empty list if it is past the end."""
+        raise NotImplementedError
+
+
+class ListPageSource(PageSource):
+    """Entries of a list."""
+
+    def __init__(self, entries, per_page):
+        super().__init__(per_page)
+        self.entries = entries
+        self.total_entries = len(entries)
+
+    @property
+    def retained_entries(self):
+        return len(self.entries)
+
+    async def get_page(self, page):
+        base = (page - 1) * self.per_page
+        return self.entries[base : base + self.per_page]
+
+
+class AsyncIteratorPageSource(PageSource):
+    """Entries of an async iterator, pulled only as far as pages are shown.
+
+    Iterators cannot be rewound, so only the last max_pages pages pulled are kept to
+    show them again, and earlier pages become unavailable. The total is unknown until
+    the iterator is exhausted.
+    """
+
+    def __init__(self, iterator, per_page, *, max_pages=PAGE_CACHE_SIZE):
+        super().__init__(per_page)
+        self.iterator = iterator.__aiter__()
+        self.max_pages = max_pages
+        self.pages = collections.OrderedDict()
+        self.pulled_pages = 0
+        self.pulled_entries = 0
+        # One entry is read ahead to know whether the last pulled page is the last page
+        self.lookahead = []
+
+    @property
+    def retained_entries(self):
+        return sum(len(entries) for entries in self.pages.values())
+
+    async def pull_page(self):
+        entries, self.lookahead = self.lookahead, []
+        while len(entries) <= self.per_page:
+            try:
+                entries.append(await self.iterator.__anext__())
+            except StopAsyncIteration:
+                self.total_entries = self.pulled_entries + len(entries)
+                break
+        if len(entries) > self.per_page:
+            self.lookahead = [entries.pop()]
+        self.pulled_entries += len(entries)
+        if not entries:
+            return
+        self.pulled_pages += 1
+        self.pages[self.pulled_pages] = entries
+        if len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+            self.first_available_page = next(iter(self.pages))
+
+    async def get_page(self, page):
+        while self.total_entries is None and self.pulled_pages < page:
+            await self.pull_page()
+        return self.pages.get(page, [])
+
+
+class QueryPageSource(PageSource):
+    """Rows of a database query, fetched with one LIMIT and OFFSET query per page.
+
+    The query should have an ORDER BY clause for pages to be stable, and must not have
+    LIMIT or OFFSET clauses. Without count_query the total is unknown until the last
+    page is fetched, which is detected by asking for one row more than per_page.
+    """
+
+    def __init__(self, pool, query, *args, per_page, count_query=None, format_row=str):
+        super().__init__(per_page)
+        self.pool = pool
+        self.query = query
+        self.args = args
+        self.count_query = count_query
+        self.format_row = format_row
+
+    async def prepare(self):
+        if self.count_query is not None:
+            self.total_entries = await self.pool.fetchval(self.count_query, *self.args)
+
+    async def get_page(self, page):
+        base = (page - 1) * self.per_page
+        index = len(self.args)
+        rows = await self.pool.fetch(
+            f"{self.query} LIMIT ${index + 1} OFFSET ${index + 2}",
+            *self.args,
+            self.per_page + 1,
+            base,
+        )
+        if len(rows) > self.per_page:
+            rows = rows[: self.per_page]
+        elif self.total_entries is None and (rows or page == 1):
+            self.total_entries = base + len(rows)
+        return [self.format_row(row) for row in rows]
+
 
 class EmbedPaginator:
     """Implements a paginator that queries the user for the pagination interface.
@@ -34,6 +213,9 @@ class EmbedPaginator:
         The context of the command.
     entries: List[str]
         A list of entries to paginate.
+    source: Optional[PageSource]
+        A source fetching entries page by page, used instead of entries.
+        The per_page of the source is used.
     per_page: int
         How many entries show up per page.
     message_content: Optional[str]
@@ -58,7 +240,8 @@ class EmbedPaginator:
         self,
         ctx,
         *,
-        entries,
+        entries=None,
+        source=None,
         per_page=12,
         message_content=None,
         show_entry_count=True,
@@ -72,19 +255,18 @@ class EmbedPaginator:
         self.channel = ctx.channel
         self.author = ctx.author
 
-        self.entries = entries
-        self.per_page = per_page
+        self.source = source or ListPageSource(entries, per_page)
+        self.per_page = self.source.per_page
         self.message_content = message_content
         self.show_entry_count = show_entry_count
         self.numbered = numbered
         self.help_option = help_option
-        pages, left_over = divmod(len(self.entries), self.per_page)
-        pages += bool(left_over)
         self.current_page = 0
-        self.maximum_pages = pages
         self.embed = discord.Embed(color=config["MAIN_COLOR"])
-        self.paginating = len(entries) > per_page
-        self.match = None
+        self.paginating = False
+        self.rendered_pages = collections.OrderedDict()
+        self.waiter = None
+        self.help_task = None
         self.reaction_emojis = [
             (FIRST_PAGE, self.first_page),
             (PREVIOUS_PAGE, self.previous_page),
@@ -99,25 +281,48 @@ class EmbedPaginator:
         if not help_option:
             self.reaction_emojis.remove((GOTO_HELP, self.show_help))
 
-    def get_page(self, page):
-        base = (page - 1) * self.per_page
-        return self.entries[base : base + self.per_page]
+    @property
+    def maximum_pages(self):
+        """Number of pages, None while the total is unknown."""
+        if self.source.total_entries is None:
+            return None
+        pages, left_over = divmod(self.source.total_entries, self.per_page)
+        return pages + bool(left_over)
+
+    async def get_page(self, page):
+        """Return the rendered lines of a page, an empty list if it is past the end."""
+        lines = self.rendered_pages.get(page)
+        if lines is not None:
+            self.rendered_pages.move_to_end(page)
+            return lines
+
+        entries = await self.source.get_page(page)
+        if self.numbered:
+            start = 1 + ((page - 1) * self.per_page)
+            lines = [f"{index}. {entry}" for index, entry in enumerate(entries, start)]
+        else:
+            lines = [f"{entry}" for entry in entries]
+
+        self.rendered_pages[page] = lines
+        if len(self.rendered_pages) > PAGE_CACHE_SIZE:
+            self.rendered_pages.popitem(last=False)
+        return lines
 
     async def show_page(self, page, *, first=False):
+        lines = list(await self.get_page(page))
+        if not lines and page != 1:
+            # Past the end of a source with an unknown total
+            return
         self.current_page = page
-        entries = self.get_page(page)
-        lines = []
-        if self.numbered:
-            for index, entry in enumerate(entries, 1 + ((page - 1) * self.per_page)):
-                lines.append(f"{index}. {entry}")
-        else:
-            lines.extend(f"{entry}" for entry in entries)
 
-        if self.maximum_pages > 1:
+        maximum_pages = self.maximum_pages
+        if maximum_pages is None:
+            self.embed.set_footer(text=f"Page {page}")
+        elif maximum_pages > 1:
             if self.show_entry_count:
-                text = f"Page {page}/{self.maximum_pages} ({len(self.entries)} entries)"
+                text = f"Page {page}/{maximum_pages} ({self.source.total_entries} entries)"
             else:
-                text = f"Page {page}/{self.maximum_pages}"
+                text = f"Page {page}/{maximum_pages}"
 
             self.embed.set_footer(text=text)
 
@@ -136,25 +341,50 @@ class EmbedPaginator:
 
         self.embed.description = "\n".join(lines)
         self.message = await self.ctx.send(self.message_content, embed=self.embed)
+        # Allow us to react to reactions right away
+        self.bot.loop.create_task(self.add_reactions())
 
+    def get_shown_reactions(self):
+        maximum_pages = self.maximum_pages
         for (reaction, _) in self.reaction_emojis:
-            if self.maximum_pages == 2 and reaction in (FIRST_PAGE, LAST_PAGE):
+            if maximum_pages == 2 and reaction in (FIRST_PAGE, LAST_PAGE):
                 # Don't add |<< or >>| buttons if there is only two pages
                 # But we still accept it nonetheless if user reacts
                 continue
+            if maximum_pages is None and reaction == LAST_PAGE:
+                # The last page is not known
+                continue
+            yield reaction
+
+    async def add_reactions(self):
+        for reaction in self.get_shown_reactions():
             await self.message.add_reaction(reaction)
 
+    def is_page_available(self, page):
+        maximum_pages = self.maximum_pages
+        if page < 1 or (maximum_pages is not None and page > maximum_pages):
+            return False
+        # Sources may drop early pages, which are still shown if rendered before
+        return page >= self.source.first_available_page or page in self.rendered_pages
+
     async def checked_show_page(self, page):
-        if page != 0 and page <= self.maximum_pages:
+        if self.is_page_available(page):
             await self.show_page(page)
 
     async def first_page(self):
         """Navigate to the first page."""
-        await self.show_page(1)
+        first_available_page = self.source.first_available_page
+        await self.show_page(
+            min(
+                (page for page in self.rendered_pages if page < first_available_page),
+                default=first_available_page,
+            )
+        )
 
     async def last_page(self):
         """Navigate to the last page."""
-        await self.show_page(self.maximum_pages)
+        if self.maximum_pages is not None:
+            await self.show_page(self.maximum_pages)
 
     async def next_page(self):
         """Go to the next page."""
@@ -173,26 +403,24 @@ class EmbedPaginator:
         to_delete = []
         to_delete.append(await self.ctx.send("What page do you want to go to?"))
 
-        def check(message):
-            return (
-                message.author == self.author
-                and self.channel == message.channel
-                and message.content.isdigit()
-            )
-
         try:
-            msg = await self.bot.wait_for("message", check=check, timeout=30.0)
+            msg = await self.bot.interactions.wait_for_message(
+                self.channel.id,
+                self.author.id,
+                check=lambda message: message.content.isdigit(),
+                timeout=30.0,
+            )
         except asyncio.TimeoutError:
             to_delete.append(await self.ctx.send("Took too long."))
             await asyncio.sleep(5)
         else:
             page = int(msg.content)
             to_delete.append(msg)
-            if page != 0 and page <= self.maximum_pages:
+            if self.is_page_available(page):
                 await self.show_page(page)
-            else:
+            if self.current_page != page:
                 to_delete.append(
-                    await self.ctx.send(f"Invalid page given. ({page}/{self.maximum_pages})")
+                    await self.ctx.send(f"Invalid page given. ({page}/{self.maximum_pages or '?'})")
                 )
                 await asyncio.sleep(5)
 
@@ -218,13 +446,24 @@ class EmbedPaginator:
             await asyncio.sleep(60)
             await self.show_current_page()
 
-        self.bot.loop.create_task(go_back_to_current_page())
+        if self.help_task is not None:
+            self.help_task.cancel()
+        self.help_task = self.bot.loop.create_task(go_back_to_current_page())
 
     async def stop_pagination(self):
         """Stop the interactive paginator session."""
         self.bot.loop.create_task(self.remove_reactions())
         self.paginating = False
 
+    def close(self):
+        """Stop the session from outside of its interactive loop."""
+        self.paginating = False
+        if self.waiter is not None:
+            self.waiter.cancel()
+        if self.help_task is not None:
+            self.help_task.cancel()
+        self.bot.loop.create_task(self.remove_reactions())
+
     async def remove_reactions(self, *, individually=True):
         try:
             await self.message.clear_reactions()
@@ -232,52 +471,58 @@ class EmbedPaginator:
             if not individually:
                 return
 
-            for (reaction, _) in self.reaction_emojis:
-                if self.maximum_pages == 2 and reaction in (FIRST_PAGE, LAST_PAGE):
-                    # |<< or >>| buttons were not added so skip
-                    continue
+            for reaction in self.get_shown_reactions():
                 try:
                     await self.message.remove_reaction(reaction, self.ctx.me)
                 except Exception:  # pylint: disable=broad-except
                     pass
 
-    def react_check(self, reaction, user):
-        if user.id != self.author.id:
-            return False
-
-        if reaction.message.id != self.message.id:
-            return False
-
-        for (emoji, func) in self.reaction_emojis:
-            if reaction.emoji == emoji:
-                self.match = func
-                return True
-        return False
+    def get_reaction_action(self, emoji):
+        for (reaction, func) in self.reaction_emojis:
+            if str(emoji) == reaction:
+                return func
+        return None
 
     async def paginate(self):
         """Paginate the entries and run the interactive loop if necessary."""
-        first_page = self.show_page(1, first=True)
-        if not self.paginating:
-            await first_page
+        await self.source.prepare()
+        if self.maximum_pages is not None:
+            self.paginating = self.maximum_pages > 1
         else:
-            # Allow us to react to reactions right away if we're paginating
-            self.bot.loop.create_task(first_page)
+            # A full first page of a source with an unknown total may be followed by more
+            self.paginating = len(await self.get_page(1)) == self.per_page
+        await self.show_page(1, first=True)
+        if not self.paginating:
+            return
 
+        self.bot.paginators.add(self)
+        try:
+            await self._run_interactive_loop()
+        finally:
+            self.bot.paginators.remove(self)
+            if self.help_task is not None:
+                self.help_task.cancel()
+
+    async def _run_interactive_loop(self):
         while self.paginating:
-            done, pending = await asyncio.wait(
-                [
-                    self.bot.wait_for("reaction_add", check=self.react_check, timeout=120),
-                    self.bot.wait_for("reaction_remove", check=self.react_check, timeout=120),
-                ],
-                return_when=asyncio.FIRST_COMPLETED,
+            # Adding and removing a reaction both count as pressing its button
+            self.waiter = self.bot.loop.create_task(
+                self.bot.interactions.wait_for_reaction(
+                    self.message.id, self.author.id, timeout=120
+                )
             )
             try:
-                done.pop().result()
+                payload = await self.waiter
+            except asyncio.CancelledError:
+                if self.paginating:
+                    raise
+                # Closed by the registry
+                return
             except asyncio.TimeoutError:
                 self.paginating = False
                 self.bot.loop.create_task(self.remove_reactions())
             else:
-                await self.match()
-            finally:
-                for future in pending:
-                    future.cancel()
+                self.bot.paginators.touch(self)
+                action = self.get_reaction_action(payload.emoji)
+                if action is not None:
+                    await action()